@@ -0,0 +1,90 @@
+"""Benchmark the ingestion cleaning stage against the notebook's cleaning path.
+
+Raw worksheet-like frames are rebuilt from the dashboard CSVs (times as
+``datetime.time`` cells, flags as 'True'/'False' text, the combined Wind
+column) and cleaned both ways; the outputs are checked to agree.
+
+    python bench_cleaning.py [--scale N] [--repeat R]
+"""
+import argparse
+import datetime
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from bird_ingest import cap_outliers, clean_sheet, format_seconds
+
+
+def raw_sheet(path, scale=1):
+    """A frame shaped like one parsed workbook sheet."""
+    frame = pd.read_csv(path)
+    frame['Wind'] = frame['Wind_Label'] + ' ' + frame['Wind_Effect'].fillna('')
+    frame = frame.drop(columns=['Month', 'month_name', 'Wind_Label', 'Wind_Effect', 'Sheet'], errors='ignore')
+    frame['Date'] = pd.to_datetime(frame['Date'])
+    for col in ('Start_Time', 'End_Time'):
+        frame[col] = [datetime.time.fromisoformat(value) for value in frame[col]]
+    for col in ('Initial_Three_Min_Cnt', 'Regional_Stewardship_Status', 'PIF_Watchlist_Status'):
+        frame[col] = frame[col].astype(str).astype(object)
+    return pd.concat([frame] * scale, ignore_index=True)
+
+
+def notebook_clean(df):
+    """The cleaning cells of bird_grassland.ipynb, unchanged in substance."""
+    df = df.copy()
+    df['Month'] = df['Date'].dt.month
+    df['month_name'] = df['Month'].map({5: 'May', 6: 'June', 7: 'July'})
+    df['Start_Time'] = pd.to_datetime(df['Start_Time'].astype(str), format='%H:%M:%S').dt.time
+    df['End_Time'] = pd.to_datetime(df['End_Time'].astype(str), format='%H:%M:%S').dt.time
+    df['Visit'] = df['Visit'].astype(int)
+    df['Initial_Three_Min_Cnt'] = df['Initial_Three_Min_Cnt'].astype(str).map({'True': True, 'False': False}).astype('bool')
+    df['Regional_Stewardship_Status'] = df['Regional_Stewardship_Status'].astype(str).str.strip().map({'True': True, 'False': False})
+    df['PIF_Watchlist_Status'] = df['PIF_Watchlist_Status'].astype(str).str.strip().map({'True': True, 'False': False})
+    split_1 = df['Wind'].str.split('(', n=1, expand=True)
+    split_2 = split_1[1].str.split(')', n=1, expand=True)
+    df['Wind_Desc'] = split_1[0].str.strip()
+    df['Wind_Speed'] = split_2[0].str.strip()
+    df['Wind_Effect'] = split_2[1].str.strip(' ,')
+    df['Wind_Label'] = df['Wind_Desc'] + ' (' + df['Wind_Speed'] + ')'
+    df = df.drop(['Wind_Desc', 'Wind_Speed', 'Wind'], axis=1)
+    df = df.dropna(subset=[col for col in ('AcceptedTSN', 'TaxonCode', 'NPSTaxonCode', 'ID_Method') if col in df])
+    df['Distance'] = df['Distance'].ffill()
+    for col in ('Temperature', 'Humidity'):
+        upper_limit = df[col].mean() + 3 * df[col].std()
+        lower_limit = df[col].mean() - 3 * df[col].std()
+        df[col] = np.where(df[col] > upper_limit, upper_limit,
+                           np.where(df[col] < lower_limit, lower_limit, df[col]))
+    return df
+
+
+def pipeline_clean(df):
+    return cap_outliers(clean_sheet(df, 'bench'))
+
+
+def check_agreement(old, new):
+    assert len(old) == len(new)
+    assert (old['Wind_Label'].to_numpy() == new['Wind_Label'].to_numpy()).all()
+    assert (old['Wind_Effect'].fillna('').to_numpy() == new['Wind_Effect'].fillna('').to_numpy()).all()
+    assert (old['Start_Time'].astype(str).to_numpy() == format_seconds(new['Start_Time']).to_numpy()).all()
+    assert (old['PIF_Watchlist_Status'].to_numpy() == new['PIF_Watchlist_Status'].to_numpy()).all()
+    assert np.allclose(old['Humidity'], new['Humidity'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=10, help="copies of each CSV per frame")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for path in ('forest_bird.csv', 'grassland_bird.csv'):
+        raw = raw_sheet(path, args.scale)
+        check_agreement(notebook_clean(raw), pipeline_clean(raw))
+        old = min(timeit.repeat(lambda: notebook_clean(raw), number=1, repeat=args.repeat))
+        new = min(timeit.repeat(lambda: pipeline_clean(raw), number=1, repeat=args.repeat))
+        objects = sum(dtype == object for dtype in pipeline_clean(raw).dtypes)
+        print(f"{path}: {len(raw)} rows  notebook {old * 1000:.1f} ms  pipeline {new * 1000:.1f} ms "
+              f"({old / new:.1f}x)  object columns left: {objects}")
+
+
+if __name__ == '__main__':
+    main()
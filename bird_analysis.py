@@ -0,0 +1,155 @@
+"""Habitat-parameterized aggregates behind the dashboard pages.
+
+Every function takes ``habitats`` first: a single habitat key returns that
+habitat's aggregate, a sequence of keys (or ``None`` for all) returns the
+aggregate indexed by ``habitat`` first. Each aggregate is computed in one pass
+over the combined frame and cached by the dataset service.
+"""
+import pandas as pd
+
+from bird_service import (count_by, get_interval_matrix, get_observer_effects, get_observer_metrics,
+                          get_species_profiles, mean_by, richness_by, sum_by)
+
+# --- Shared Filters ---
+# Filters are ((column, values), ...) specs applied as masks inside the cached
+# aggregates, so no page copies or mutates the shared frames.
+DISTANCE_BANDS = ('<= 50 Meters', '50 - 100 Meters')
+ID_METHODS = ('Singing', 'Calling', 'Visualization')
+VISITS = (1, 2)
+
+IN_DISTANCE_BANDS = (('Distance', DISTANCE_BANDS),)
+ON_WATCHLIST = (('PIF_Watchlist_Status', (True,)),)
+UNDER_STEWARDSHIP = (('Regional_Stewardship_Status', (True,)),)
+
+
+# --- Species Richness ---
+def species_richness(habitats, *dims, where=None):
+    """Distinct species per combination of ``dims`` under any filter spec.
+
+    Answered from the observation cube or the species-presence index when
+    they cover the request, e.g. ``species_richness(h, 'Observer', 'Sky',
+    'month_name', where=ON_WATCHLIST)``.
+    """
+    return richness_by(habitats, *dims, where=where).rename('Species_Richness')
+
+
+# --- Species Frequency per Site ---
+def site_richness(habitats):
+    return richness_by(habitats, 'Admin_Unit_Code').rename('Species_Richness')
+
+
+def site_counts(habitats):
+    return count_by(habitats, 'Admin_Unit_Code').rename('Bird_Count')
+
+
+# --- Species Behavior and Detection Patterns ---
+def interval_proportions(habitats):
+    """Species x Interval_Length share of each interval's detections."""
+    counts = count_by(habitats, 'Common_Name', 'Interval_Length').unstack(fill_value=0)
+    # Normalize by total detections per interval (within each habitat)
+    if 'habitat' in counts.index.names:
+        return counts / counts.groupby(level='habitat', observed=True).transform('sum')
+    return counts / counts.sum(axis=0)
+
+
+def interval_matrix(habitat):
+    """Incrementally maintained species x interval proportions of one habitat."""
+    return get_interval_matrix(habitat)
+
+
+def distance_band_counts(habitats):
+    return count_by(habitats, 'Common_Name', 'Distance', where=IN_DISTANCE_BANDS).rename('Count')
+
+
+def distance_totals(habitats):
+    return count_by(habitats, 'Distance', where=IN_DISTANCE_BANDS).rename('Total Observations')
+
+
+def id_method_totals(habitats):
+    where = IN_DISTANCE_BANDS + (('ID_Method', ID_METHODS),)
+    return count_by(habitats, 'ID_Method', where=where).rename('Total Observations')
+
+
+def visit_totals(habitats):
+    where = IN_DISTANCE_BANDS + (('Visit', VISITS),)
+    return count_by(habitats, 'Visit', where=where).rename('Total Observations')
+
+
+def species_in_bands(habitats):
+    return distance_band_counts(habitats).index.get_level_values('Common_Name').unique()
+
+
+def species_detections(habitats, species, dim):
+    """Presence-weighted detections of one species broken down by ``dim``."""
+    where = IN_DISTANCE_BANDS + (('Common_Name', (species,)),)
+    return sum_by(habitats, 'Presence', dim, where=where).rename('Detections')
+
+
+def species_profile(habitat, species):
+    """Every detection breakdown of one species, served from the profile store."""
+    return get_species_profiles(habitat, IN_DISTANCE_BANDS).profile(species)
+
+
+# --- Environmental Influence ---
+def condition_counts(habitats, condition):
+    return count_by(habitats, condition).rename('Observation_Count')
+
+
+def condition_richness(habitats, condition):
+    return richness_by(habitats, condition).rename('Species_Richness')
+
+
+def behavior_by_condition(habitats, condition):
+    return count_by(habitats, condition, 'ID_Method').rename('Count')
+
+
+# --- Observer Analysis ---
+def observer_summary(habitats):
+    """Observation count, species richness and initial detection rate per observer."""
+    return pd.concat([
+        count_by(habitats, 'Observer').rename('Observation_Count'),
+        richness_by(habitats, 'Observer').rename('Species_Richness'),
+        mean_by(habitats, 'Initial_Three_Min_Cnt', 'Observer').rename('Detection_Rate'),
+    ], axis=1)
+
+
+def observer_metrics(habitat):
+    """Observer metrics engine of one habitat; filter with ``where`` specs on its methods."""
+    return get_observer_metrics(habitat)
+
+
+def observer_effects(habitat):
+    """Observer-effect detection model of one habitat, refit per ``where`` spec."""
+    return get_observer_effects(habitat)
+
+
+# --- Temporal Analysis ---
+def species_month_counts(habitats):
+    return count_by(habitats, 'Common_Name', 'month_name').rename('Count')
+
+
+def time_group_counts(habitats):
+    return count_by(habitats, 'month_name', 'Common_Name', 'Time_Group').rename('Count')
+
+
+# --- Conservation Insights ---
+def status_counts(habitats, column):
+    return count_by(habitats, column)
+
+
+def watchlist_species_counts(habitats):
+    return count_by(habitats, 'Common_Name', where=ON_WATCHLIST)
+
+
+def stewardship_species_counts(habitats):
+    return count_by(habitats, 'Common_Name', where=UNDER_STEWARDSHIP)
+
+
+def priority_species_counts(habitats):
+    return count_by(habitats, 'Common_Name', where=ON_WATCHLIST + UNDER_STEWARDSHIP)
+
+
+# --- Observation Browser ---
+def column_values(habitat, column):
+    """Observed values of ``column`` in one habitat, for the browser filters."""
+    return count_by(habitat, column).index
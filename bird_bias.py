@@ -0,0 +1,183 @@
+"""Observer-effect detection model and bias-adjusted species counts.
+
+Each observer gets a constant per-minute detection rate ``lambda``; the
+chance of recording a species that is present during a count of ``T``
+minutes is ``P = 1 - exp(-lambda * T)``. Two parts of the survey design
+inform it:
+
+* time to first detection: ``Interval_Length`` together with
+  ``Initial_Three_Min_Cnt`` places every record in one of the intervals
+  cut at the interval bounds and at three minutes (a removal model);
+  records whose early flag is unknown are left out of this part only;
+* repeat visits: for each species detected on one ``Visit`` to a plot, the
+  observer of every other visit to that plot in the same ``Year`` either
+  recorded it too or missed it, a Bernoulli trial with probability
+  ``phi * P``, where the availability ``phi`` (the species still being
+  there and vocal on the other visit) is shared by all observers.
+
+The joint log-likelihood of every observer is evaluated over a shared grid
+of rates and availabilities as batched array math, so a refit under any
+filter is a few bincounts and one broadcast. Intervals come from the
+profile likelihood at the fitted availability. Adjusted counts weight every
+record by ``1 / P`` of its observer, i.e. correct for observer detection
+only, not for availability.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+EFFECT_KEYS = ['Observer', 'Plot_Name', 'Visit', 'Common_Name', 'Admin_Unit_Code', 'Year', 'month_name']
+EFFECT_COLUMNS = EFFECT_KEYS + ['Interval_Length', 'Initial_Three_Min_Cnt']
+EARLY_MINUTES = 3.0
+RATE_GRID = np.geomspace(1e-3, 5.0, 2000)
+AVAILABILITY_GRID = np.linspace(0.01, 0.99, 99)
+# Half the 95% quantile of chi-square(1): the profile-likelihood interval drop.
+CI_DROP = 1.92
+POOLED = 'All observers'
+
+
+def interval_bounds(labels):
+    """(start, end) minutes of Interval_Length labels such as '2.5 - 5 min'."""
+    bounds = [tuple(float(value) for value in re.findall(r'\d+(?:\.\d+)?', str(label))[:2]) for label in labels]
+    return np.array([bound[0] for bound in bounds]), np.array([bound[1] for bound in bounds])
+
+
+class ObserverEffects:
+    def __init__(self, labels, codes, cells, edges):
+        self.labels = labels
+        self.codes = codes
+        self.cells = cells
+        self.edges = edges
+
+    @classmethod
+    def build(cls, frame):
+        """Code the records of ``frame`` (EFFECT_COLUMNS) once."""
+        labels, columns = {}, {}
+        for key in EFFECT_KEYS + ['Interval_Length']:
+            codes, uniques = pd.factorize(frame[key], sort=True)
+            labels[key] = pd.Index(uniques, name=key)
+            columns[key] = codes
+        complete = np.all([codes >= 0 for codes in columns.values()], axis=0)
+        codes = pd.DataFrame({key: columns[key][complete] for key in EFFECT_KEYS})
+
+        starts, ends = interval_bounds(labels['Interval_Length'])
+        interval = columns['Interval_Length'][complete]
+        flag = frame['Initial_Three_Min_Cnt'].to_numpy(dtype=float, na_value=np.nan)[complete]
+        known, early = ~np.isnan(flag), flag > 0
+        low, high = starts[interval], ends[interval]
+        # The interval holding the three-minute mark is split by the early flag.
+        split = (low < EARLY_MINUTES) & (high > EARLY_MINUTES)
+        low = np.where(split & ~early, EARLY_MINUTES, low)
+        edges = np.unique(np.r_[starts, ends, EARLY_MINUTES if split.any() else starts[:0]])
+        # Unknown flags get no time cell (-1) but keep their repeat-visit trials.
+        return cls(labels, codes, np.where(known, np.searchsorted(edges, low), -1), edges)
+
+    # --- Filters ---
+    def mask(self, where=None):
+        """Records matching ((column, values), ...) over any of EFFECT_KEYS."""
+        keep = np.ones(len(self.codes), dtype=bool)
+        for column, values in where or ():
+            wanted = self.labels[column].get_indexer(list(values))
+            keep &= np.isin(self.codes[column].to_numpy(), wanted[wanted >= 0])
+        return keep
+
+    def _repeat_trials(self, keep):
+        """Per-observer (trials, redetections) from species seen on another visit to the same plot.
+
+        A survey is one visit to a plot in one year, so repeat visits are
+        only paired within a season and an archive spanning several years
+        does not merge different surveys (and their observers) into one.
+        """
+        n_observers = len(self.labels['Observer'])
+        n_visits, n_species = len(self.labels['Visit']), len(self.labels['Common_Name'])
+        n_years = len(self.labels['Year'])
+        plot_year = self.codes['Plot_Name'].to_numpy()[keep] * n_years + self.codes['Year'].to_numpy()[keep]
+        plot_visit = plot_year * n_visits + self.codes['Visit'].to_numpy()[keep]
+        surveys, first = np.unique(plot_visit, return_index=True)
+        survey_observer = self.codes['Observer'].to_numpy()[keep][first]
+        detections = np.unique(plot_visit * n_species + self.codes['Common_Name'].to_numpy()[keep])
+
+        # Pair every detection with every surveyed visit of its plot that
+        # year (surveys are sorted by plot and year).
+        survey_plot = surveys // n_visits
+        detection_survey = detections // n_species
+        lo = np.searchsorted(survey_plot, detection_survey // n_visits, side='left')
+        counts = np.searchsorted(survey_plot, detection_survey // n_visits, side='right') - lo
+        source = np.repeat(np.arange(len(detections)), counts)
+        other = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+        paired = surveys[other] != detection_survey[source]
+        source, other = source[paired], other[paired]
+
+        target = surveys[other] * n_species + detections[source] % n_species
+        found = np.searchsorted(detections, target)
+        hit = (found < len(detections)) & (detections[np.minimum(found, len(detections) - 1)] == target)
+        observer = survey_observer[other]
+        return (np.bincount(observer, minlength=n_observers),
+                np.bincount(observer, weights=hit, minlength=n_observers))
+
+    def _fit(self, keep):
+        """Per-observer arrays of the fit; the last row pools every observer."""
+        n_observers, n_cells = len(self.labels['Observer']), len(self.edges) - 1
+        timed = keep & (self.cells >= 0)
+        observer = self.codes['Observer'].to_numpy()[timed]
+        times = np.bincount(observer * n_cells + self.cells[timed], minlength=n_observers * n_cells)
+        times = times.reshape(n_observers, n_cells).astype(float)
+        trials, hits = self._repeat_trials(keep)
+        times = np.vstack([times, times.sum(axis=0)])
+        trials, hits = np.r_[trials, trials.sum()], np.r_[hits, hits.sum()]
+
+        survival = np.exp(-np.outer(self.edges, RATE_GRID))
+        detection = -np.expm1(-self.edges[-1] * RATE_GRID)
+        with np.errstate(divide='ignore'):
+            log_cells = np.log(survival[:-1] - survival[1:]) - np.log(detection)
+        # (observer, rate, availability) log-likelihood
+        redetection = np.outer(detection, AVAILABILITY_GRID)
+        loglik = ((times @ log_cells)[:, :, None]
+                  + hits[:, None, None] * np.log(redetection)
+                  + (trials - hits)[:, None, None] * np.log1p(-redetection))
+        # Availability is shared: maximize the observers' summed profile likelihood.
+        shared = loglik[:-1].max(axis=1).sum(axis=0).argmax()
+        loglik = loglik[:, :, shared]
+        best = loglik.argmax(axis=1)
+        within = loglik >= loglik.max(axis=1, keepdims=True) - CI_DROP
+        has_data = (times.sum(axis=1) + trials) > 0
+        return {
+            'Records': times.sum(axis=1).astype(np.int64),
+            'Repeat_Trials': trials.astype(np.int64),
+            'Redetections': hits.astype(np.int64),
+            'Rate_Per_Minute': np.where(has_data, RATE_GRID[best], np.nan),
+            'Detection': np.where(has_data, detection[best], np.nan),
+            'Detection_Low': np.where(has_data, np.where(within, detection, np.inf).min(axis=1), np.nan),
+            'Detection_High': np.where(has_data, np.where(within, detection, -np.inf).max(axis=1), np.nan),
+            'Availability': np.full(len(times), AVAILABILITY_GRID[shared] if trials[-1] else np.nan),
+        }
+
+    # --- Estimates ---
+    def fit(self, where=None):
+        """Detection estimates per observer under a filter, plus the pooled fit."""
+        index = self.labels['Observer'].astype(object).append(pd.Index([POOLED], dtype=object)).rename('Observer')
+        return pd.DataFrame(self._fit(self.mask(where)), index=index)
+
+    def adjusted_counts(self, where=None):
+        """Observed and observer-adjusted records per (Admin_Unit_Code, Common_Name).
+
+        Observers without data under the filter fall back to the pooled fit.
+        """
+        keep = self.mask(where)
+        detection = self._fit(keep)['Detection']
+        detection = np.where(np.isnan(detection[:-1]), detection[-1], detection[:-1])
+        weights = 1.0 / detection[self.codes['Observer'].to_numpy()[keep]]
+        keys = self.codes.loc[keep, ['Admin_Unit_Code', 'Common_Name']].to_numpy()
+        groups, group = np.unique(keys, axis=0, return_inverse=True)
+        group = group.ravel()
+        index = pd.MultiIndex.from_arrays([self.labels['Admin_Unit_Code'].take(groups[:, 0]),
+                                           self.labels['Common_Name'].take(groups[:, 1])])
+        return pd.DataFrame({
+            'Observed': np.bincount(group, minlength=len(groups)).astype(np.int64),
+            'Adjusted': np.bincount(group, weights=weights, minlength=len(groups)),
+        }, index=index)
+
+    def site_counts(self, where=None):
+        """Observed and adjusted records per site."""
+        return self.adjusted_counts(where).groupby(level='Admin_Unit_Code', observed=True).sum()
@@ -0,0 +1,205 @@
+"""Keyset-paginated browsing of raw observations.
+
+Pages are addressed by ``Observation_Id`` (the 1-based row position in the
+source CSV or Parquet directory, or the key column written by ``bird_db.py
+load``): a page is the first ``limit`` matching rows with an id greater than
+the cursor. Only the requested page is ever read: database sources run one
+``WHERE id > ? ... ORDER BY id LIMIT ?`` query, file sources read Parquet one
+row group at a time and skip groups that lie before the cursor or outside the
+date range.
+"""
+import collections
+
+import pandas as pd
+
+import bird_chunks
+import bird_service
+from bird_data import apply_schema
+from bird_db import ROW_ID_COLUMN, execute_query, get_pool, quote_identifier
+from bird_schema import TIME_COLUMNS, date_scalar
+from bird_sql import filter_conditions
+
+BROWSE_COLUMNS = [
+    'Date', 'Start_Time', 'Admin_Unit_Code', 'Plot_Name', 'Observer', 'Visit',
+    'Common_Name', 'ID_Method', 'Distance', 'Interval_Length', 'Sky',
+    'Temperature', 'Humidity'
+]
+PAGE_SIZES = (25, 50, 100, 250)
+
+Page = collections.namedtuple('Page', ['rows', 'next_cursor'])
+
+
+def browse_filters(species=(), sites=(), observers=()):
+    """Filter spec for the browser's multiselects; empty selections match all."""
+    where = (('Common_Name', species), ('Admin_Unit_Code', sites), ('Observer', observers))
+    return tuple((column, tuple(values)) for column, values in where if values)
+
+
+def _as_timestamp(value):
+    return pd.Timestamp(value) if value is not None else None
+
+
+# --- Parquet Source ---
+def _parquet_files(habitat):
+    # A CSV habitat has one cache file; a Parquet directory is read in order.
+    try:
+        import pyarrow.parquet as pq
+        paths = bird_chunks.source_files(bird_service.HABITATS[habitat])
+    except (ImportError, RuntimeError):
+        return None
+    return [pq.ParquetFile(path) for path in paths]
+
+
+def _row_groups(parquets):
+    """(file, group index, metadata, schema) for every row group in order."""
+    for parquet in parquets:
+        for group in range(parquet.metadata.num_row_groups):
+            yield parquet, group, parquet.metadata.row_group(group), parquet.schema_arrow
+
+
+def _date_stats(row_group, schema):
+    if 'Date' not in schema.names:
+        return None
+    stats = row_group.column(schema.names.index('Date')).statistics
+    if stats is None or not stats.has_min_max:
+        return None
+    return pd.Timestamp(stats.min), pd.Timestamp(stats.max)
+
+
+def _filter_rows(chunk, where, dates):
+    mask = bird_service.where_mask(chunk, where)
+    if dates is not None:
+        start, end = dates
+        in_range = pd.Series(True, index=chunk.index)
+        if start is not None:
+            in_range &= chunk['Date'] >= date_scalar(start, chunk['Date'].dtype)
+        if end is not None:
+            in_range &= chunk['Date'] <= date_scalar(end, chunk['Date'].dtype)
+        mask = in_range if mask is None else mask & in_range
+    return chunk if mask is None else chunk[mask]
+
+
+def _parquet_page(parquets, after, limit, where, dates, columns):
+    read = list(dict.fromkeys([*columns, *(col for col, _ in where or ()),
+                               *(['Date'] if dates is not None else [])]))
+    start, end = map(_as_timestamp, dates or (None, None))
+    parts = []
+    found = 0
+    offset = 0
+    for parquet, group, row_group, schema in _row_groups(parquets):
+        first, offset = offset + 1, offset + row_group.num_rows
+        if offset <= after:
+            continue
+        bounds = _date_stats(row_group, schema) if dates is not None else None
+        if bounds is not None and ((start is not None and bounds[1] < start)
+                                   or (end is not None and bounds[0] > end)):
+            continue
+        chunk = apply_schema(parquet.read_row_group(group, columns=read).to_pandas())
+        chunk.index = pd.RangeIndex(first, offset + 1, name=ROW_ID_COLUMN)
+        chunk = _filter_rows(chunk[chunk.index > after], where, dates)
+        # One row past the page tells us whether there is a next page.
+        parts.append(chunk[columns].iloc[:limit + 1 - found])
+        found += len(parts[-1])
+        if found > limit:
+            break
+    return pd.concat(parts) if parts else None
+
+
+def _frame_page(frame, after, limit, where, dates, columns):
+    # No Parquet engine: page over the shared in-memory frame instead.
+    frame = frame.iloc[after:]
+    frame = frame.set_axis(pd.RangeIndex(after + 1, after + 1 + len(frame), name=ROW_ID_COLUMN))
+    return _filter_rows(frame, where, dates)[columns].iloc[:limit + 1]
+
+
+# --- Database Source ---
+def _db_page(table, after, limit, where, dates, columns):
+    pool = get_pool()
+    key = quote_identifier(ROW_ID_COLUMN, pool)
+    conditions, params = filter_conditions(where, pool)
+    conditions.insert(0, f"{key} > {pool.placeholder}")
+    params.insert(0, int(after))
+    date = quote_identifier('Date', pool)
+    for op, value in zip(('>=', '<='), dates or ()):
+        if value is not None:
+            conditions.append(f"{date} {op} {pool.placeholder}")
+            params.append(pd.Timestamp(value).strftime('%Y-%m-%d'))
+    select = ', '.join(quote_identifier(col, pool) for col in [ROW_ID_COLUMN, *columns])
+    query = (f"SELECT {select} FROM {quote_identifier(table, pool)}"
+             f" WHERE {' AND '.join(conditions)} ORDER BY {key} LIMIT {pool.placeholder}")
+    rows = execute_query(query, [*params, limit + 1], pool=pool)
+    if rows.empty:
+        return None
+    return apply_schema(rows.set_index(ROW_ID_COLUMN))
+
+
+# --- Paging ---
+def fetch_page(habitat, after=0, limit=50, where=None, dates=None, columns=BROWSE_COLUMNS):
+    """Rows of ``habitat`` after the ``after`` cursor that match the filters.
+
+    ``where`` is a ((column, values), ...) filter spec and ``dates`` an
+    inclusive (start, end) pair, either end may be None. Returns a Page whose
+    ``next_cursor`` is None on the last page.
+    """
+    if habitat not in bird_service.HABITATS:
+        raise KeyError(f"Unknown habitat: {habitat!r}")
+    columns = list(columns)
+    after = int(after or 0)
+    if bird_service.DATA_SOURCE == 'db':
+        rows = _db_page(bird_service.habitat_table(habitat), after, limit, where, dates, columns)
+    else:
+        parquets = _parquet_files(habitat)
+        if parquets is not None:
+            rows = _parquet_page(parquets, after, limit, where, dates, columns)
+        else:
+            rows = _frame_page(bird_service.get_frame(habitat), after, limit, where, dates, columns)
+    if rows is None or rows.empty:
+        return Page(pd.DataFrame(columns=columns), None)
+    if len(rows) > limit:
+        return Page(rows.iloc[:limit], int(rows.index[limit - 1]))
+    return Page(rows, None)
+
+
+def iter_pages(habitat, limit=1000, where=None, dates=None, columns=BROWSE_COLUMNS):
+    """Stream every matching row page by page, holding one page in memory."""
+    after = 0
+    while after is not None:
+        page = fetch_page(habitat, after, limit, where, dates, columns)
+        if not page.rows.empty:
+            yield page.rows
+        after = page.next_cursor
+
+
+def date_bounds(habitat):
+    """First and last survey date of a habitat, without reading its rows."""
+    if bird_service.DATA_SOURCE == 'db':
+        pool = get_pool()
+        date = quote_identifier('Date', pool)
+        bounds = execute_query(f"SELECT MIN({date}) AS lo, MAX({date}) AS hi"
+                               f" FROM {quote_identifier(bird_service.habitat_table(habitat), pool)}", pool=pool)
+        low, high = bounds.iloc[0]
+    else:
+        parquets = _parquet_files(habitat)
+        stats = ([_date_stats(row_group, schema) for _, _, row_group, schema in _row_groups(parquets)]
+                 if parquets else [None])
+        if not parquets or any(s is None for s in stats):
+            dates = bird_service.get_frame(habitat)['Date']
+            low, high = dates.min(), dates.max()
+        else:
+            low, high = min(s[0] for s in stats), max(s[1] for s in stats)
+    if pd.isna(low) or pd.isna(high):
+        return None
+    return pd.Timestamp(low).date(), pd.Timestamp(high).date()
+
+
+def display_rows(rows):
+    """Format a page for display: plain dates and HH:MM times of day."""
+    formatted = {}
+    if 'Date' in rows.columns and pd.api.types.is_datetime64_any_dtype(rows['Date']):
+        formatted['Date'] = rows['Date'].dt.date
+    for col in TIME_COLUMNS:
+        if col in rows.columns and pd.api.types.is_integer_dtype(rows[col]):
+            # Times of day are minutes since midnight.
+            formatted[col] = ['' if pd.isna(minutes) else f"{minutes // 60:02d}:{minutes % 60:02d}"
+                              for minutes in rows[col]]
+    return rows.assign(**formatted)
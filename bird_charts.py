@@ -0,0 +1,393 @@
+"""Figure builders for the habitat pages, served through the figure cache.
+
+Every chart is a function of ``(habitat, *params)`` that returns a Plotly
+figure. ``figure_spec`` serves its JSON from the dataset service's figure
+cache, building it only on a miss, and ``prefetch`` warms that cache from a
+background thread for the panels a user has not opened yet.
+
+    BIRD_PREFETCH_WORKERS   background threads building prefetched charts (default 2)
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+import bird_analysis as ba
+import bird_scatter
+from bird_service import figure_json, habitat_rows
+
+PREFETCH_WORKERS = int(os.environ.get('BIRD_PREFETCH_WORKERS', 2))
+SPECIES_GROUPS = [f"Group {i+1}" for i in range(5)]
+SCATTER_COLUMNS = ["Temperature", "Humidity", "Common_Name", "Scientific_Name", "Distance", "Observer", "Date"]
+
+_prefetcher = None
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+# --- Figure Cache ---
+def figure_spec(chart, habitat, *params):
+    """Cached figure JSON of ``chart(habitat, *params)``."""
+    return figure_json(chart.__name__, habitat, lambda: chart(habitat, *params), *params)
+
+
+def _prefetch_one(key, chart, habitat, params):
+    try:
+        figure_spec(chart, habitat, *params)
+    finally:
+        with _pending_lock:
+            _pending.discard(key)
+
+
+def prefetch(habitat, charts):
+    """Build ``[(chart, params), ...]`` into the figure cache in the background."""
+    global _prefetcher
+    with _pending_lock:
+        if _prefetcher is None:
+            _prefetcher = ThreadPoolExecutor(PREFETCH_WORKERS, thread_name_prefix='bird-prefetch')
+        for chart, params in charts:
+            key = (chart.__name__, habitat, tuple(params))
+            if key in _pending:
+                continue
+            _pending.add(key)
+            _prefetcher.submit(_prefetch_one, key, chart, habitat, tuple(params))
+
+
+# --- Species Frequency per Site ---
+def site_richness(habitat):
+    return px.bar(
+        ba.site_richness(habitat).reset_index(),
+        x='Admin_Unit_Code',
+        y='Species_Richness',
+        labels={'Species_Richness': 'Unique Species Count'},
+        color='Species_Richness',
+        color_continuous_scale='Viridis'
+    )
+
+
+def site_counts(habitat):
+    return px.bar(
+        ba.site_counts(habitat).reset_index(),
+        x='Admin_Unit_Code',
+        y='Bird_Count',
+        color='Bird_Count',
+        color_continuous_scale='Viridis'
+    )
+
+
+# --- Species Behavior and Detection Patterns ---
+def interval_proportions(habitat, groups=(SPECIES_GROUPS[0],)):
+    """Grouped bars of each species' interval shares, one trace per interval."""
+    matrix = ba.interval_matrix(habitat)
+    group_rows = dict(zip(SPECIES_GROUPS, matrix.group_rows(len(SPECIES_GROUPS))))
+    species, proportions = matrix.take(sorted(row for group in groups for row in group_rows[group]))
+    fig = go.Figure([
+        go.Bar(name=str(interval), x=species, y=proportions[:, col])
+        for col, interval in enumerate(matrix.intervals)
+    ])
+    fig.update_layout(
+        barmode='group',
+        title="🕒 Proportional Detection of Bird Species by Time Interval",
+        xaxis_title='Species',
+        yaxis_title='Proportional Observations',
+        legend_title_text='Interval',
+        height=500
+    )
+    return fig
+
+
+def distance_bands(habitat):
+    fig = px.scatter(
+        ba.distance_band_counts(habitat).reset_index(),
+        x='Common_Name',
+        y='Count',
+        color='Distance',
+        symbol='Distance',
+        title='Species Count by Distance Band',
+        labels={'Common_Name': 'Species', 'Count': 'Observation Count'},
+        size='Count',
+    )
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        xaxis={'categoryorder': 'total ascending'},
+        height=500
+    )
+    return fig
+
+
+def species_methods(habitat, species):
+    return px.bar(
+        ba.species_profile(habitat, species)['ID_Method'].reset_index(),
+        x='ID_Method',
+        y='Detections',
+        title=f'Detection Counts by Method: {species}',
+        labels={'ID_Method': 'Detection Method', 'Detections': 'Number of Detections'},
+        color='ID_Method'
+    )
+
+
+def species_distances(habitat, species):
+    return px.bar(
+        ba.species_profile(habitat, species)['Distance'].reset_index(),
+        x='Distance',
+        y='Detections',
+        title=f'Detection Counts by Distance: {species}',
+        labels={'Distance': 'Distance from Observer', 'Detections': 'Number of Detections'},
+        color='Distance'
+    )
+
+
+# --- Environmental Influence ---
+def temperature_humidity(habitat, mode='auto'):
+    fig, _ = bird_scatter.scatter_figure(
+        habitat_rows(habitat, SCATTER_COLUMNS),
+        x="Temperature",
+        y="Humidity",
+        color="Common_Name",
+        hover_data=SCATTER_COLUMNS[3:],
+        mode=mode,
+        title="Temperature vs Humidity Colored by Common Name"
+    )
+    return fig
+
+
+def condition_counts(habitat, condition, title):
+    return px.bar(
+        ba.condition_counts(habitat, condition).reset_index(),
+        x=condition,
+        y="Observation_Count",
+        title=title,
+        labels={"Observation_Count": "Number of Observations"}
+    )
+
+
+def condition_richness(habitat, condition, title, axis_label):
+    return px.bar(
+        ba.condition_richness(habitat, condition).reset_index(),
+        x=condition,
+        y="Species_Richness",
+        title=title,
+        labels={"Species_Richness": axis_label}
+    )
+
+
+def condition_behavior(habitat, condition, title):
+    return px.bar(
+        ba.behavior_by_condition(habitat, condition).reset_index(),
+        x=condition,
+        y="Count",
+        color="ID_Method",
+        barmode="group",
+        title=title
+    )
+
+
+# --- Observer Analysis ---
+def observer_metric(habitat, metric, title, axis_label=None, where=None):
+    summary = ba.observer_metrics(habitat).summary(where).reset_index()
+    error = {}
+    if metric == 'Detection_Rate':
+        # 95% Wilson interval of each observer's first-three-minute rate
+        summary['CI_Above'] = summary['Rate_High'] - summary['Detection_Rate']
+        summary['CI_Below'] = summary['Detection_Rate'] - summary['Rate_Low']
+        error = {'error_y': 'CI_Above', 'error_y_minus': 'CI_Below'}
+    return px.bar(
+        summary,
+        x="Observer",
+        y=metric,
+        title=title,
+        labels={metric: axis_label} if axis_label else None,
+        **error
+    )
+
+
+def observer_species(habitat, where=None):
+    matrix = ba.observer_metrics(habitat).species_counts(where).unstack(fill_value=0)
+    return px.imshow(
+        matrix.T,
+        aspect="auto",
+        color_continuous_scale="Viridis",
+        labels={"x": "Observer", "y": "Common_Name", "color": "Count"},
+        title="Observer × Species Detection Heatmap"
+    )
+
+
+def observer_accumulation(habitat, where=None):
+    curve = ba.observer_metrics(habitat).accumulation(where)
+    curve['Date'] = curve['Date'].astype(str)
+    return px.line(
+        curve,
+        x="Observations",
+        y="Species",
+        color="Observer",
+        hover_data=["Date"],
+        markers=True,
+        title="Species Accumulation by Observer",
+        labels={"Observations": "Cumulative Observations", "Species": "Cumulative Species Detected"}
+    )
+
+
+def observer_detection(habitat, where=None):
+    fit = ba.observer_effects(habitat).fit(where).reset_index()
+    fit['CI_Above'] = fit['Detection_High'] - fit['Detection']
+    fit['CI_Below'] = fit['Detection'] - fit['Detection_Low']
+    return px.bar(
+        fit,
+        x="Observer",
+        y="Detection",
+        error_y="CI_Above",
+        error_y_minus="CI_Below",
+        hover_data=["Rate_Per_Minute", "Records", "Repeat_Trials", "Redetections"],
+        title="Estimated Detection Probability per Count by Observer",
+        labels={"Detection": "Detection Probability (95% CI)"}
+    )
+
+
+def adjusted_site_counts(habitat, where=None):
+    counts = ba.observer_effects(habitat).site_counts(where).reset_index()
+    return px.bar(
+        counts.melt(id_vars="Admin_Unit_Code", var_name="Count", value_name="Observations"),
+        x="Admin_Unit_Code",
+        y="Observations",
+        color="Count",
+        barmode="group",
+        title="Observed vs Observer-Adjusted Bird Counts by Admin Unit"
+    )
+
+
+# --- Temporal Analysis ---
+def species_month_heatmap(habitat):
+    species_month_matrix = ba.species_month_counts(habitat).reset_index()
+    # sort species by total count for readability
+    top_species = (
+        species_month_matrix.groupby("Common_Name", observed=True)["Count"]
+        .sum()
+        .sort_values(ascending=False)
+        .index
+    )
+    filtered_matrix = species_month_matrix[species_month_matrix["Common_Name"].isin(top_species)]
+    return px.density_heatmap(
+        filtered_matrix,
+        x="month_name",
+        y="Common_Name",
+        z="Count",
+        color_continuous_scale="Viridis",
+        title="Bird Species Activity by Month",
+        labels={"Count": "Observation Count"},
+    )
+
+
+def time_group_bars(habitat):
+    # Month, species and End_Hour time group (precomputed at load time)
+    grouped = ba.time_group_counts(habitat).reset_index().rename(columns={"month_name": "Month_Name"})
+    fig = px.bar(
+        grouped,
+        x="Common_Name",
+        y="Count",
+        color="Time_Group",
+        barmode="group",
+        facet_col="Month_Name",
+        title="Bird Observations by Time Group, Month, and Species",
+        labels={"Common_Name": "Bird Species", "Time_Group": "Start Time Group"}
+    )
+    fig.update_layout(xaxis_tickangle=90)
+    return fig
+
+
+# --- Conservation Insights ---
+STATUS_LABELS = {
+    'PIF_Watchlist_Status': {1: 'On PIF Watchlist', 0: 'Not on PIF Watchlist'},
+    'Regional_Stewardship_Status': {1: 'Under Regional Stewardship', 0: 'Not Under Stewardship'},
+}
+
+
+def status_share(habitat, column, title):
+    counts = ba.status_counts(habitat, column).sort_values(ascending=False)
+    labels = [STATUS_LABELS[column].get(index, 'Unknown') for index in counts.index]
+    percentages = (counts / counts.sum() * 100).round(1)
+    legend = [f"{label} ({pct}%)" for label, pct in zip(labels, percentages)]
+    fig = go.Figure(data=[go.Pie(
+        labels=legend,
+        values=counts.values,
+        hole=0.4,
+        marker=dict(colors=px.colors.qualitative.Set2[:len(legend)]),
+        sort=False,
+        textinfo='none'
+    )])
+    fig.update_layout(
+        title_text=title,
+        margin=dict(t=50, b=50),
+        height=300
+    )
+    return fig
+
+
+def status_species(habitat, column, title):
+    counts = {
+        'PIF_Watchlist_Status': ba.watchlist_species_counts,
+        'Regional_Stewardship_Status': ba.stewardship_species_counts,
+    }[column](habitat).sort_values(ascending=False)
+    fig = go.Figure(go.Bar(
+        x=counts.values,
+        y=counts.index,
+        orientation='h',
+        marker_color=px.colors.qualitative.Plotly[:len(counts)]
+    ))
+    fig.update_layout(
+        title_text=title,
+        margin=dict(t=50, b=50),
+        height=400,
+        yaxis=dict(autorange="reversed")
+    )
+    return fig
+
+
+def priority_species(habitat):
+    counts = ba.priority_species_counts(habitat).sort_values()
+    fig = go.Figure(data=[
+        go.Bar(
+            x=counts.values,
+            y=counts.index,
+            orientation='h',
+            marker=dict(color='teal')
+        )
+    ])
+    fig.update_layout(
+        title='Observations of Priority or Rare Species',
+        xaxis_title='Number of Observations',
+        yaxis_title='Common Name',
+        height=300,
+        width=300,
+        margin=dict(t=50, b=50)
+    )
+    return fig
+
+
+# --- Page Views ---
+# Chart variants the pages offer, shared with the headless exporter.
+SKY_VIEWS = {
+    "Observation Count": (condition_counts, ("Sky", "Bird Observations by Sky Condition")),
+    "Species Richness": (condition_richness, ("Sky", "Species Richness by Sky Condition", "Number of Unique Species")),
+    "Behavior (Singing vs Calling)": (condition_behavior, ("Sky", "Bird Behavior (Singing/Calling) by Sky Condition")),
+}
+WIND_CHARTS = [
+    (condition_counts, ("Wind_Label", "Bird Observations by Wind Strength")),
+    (condition_richness, ("Wind_Label", "Species Richness by Wind Effect", "Unique Species Observed")),
+    (condition_behavior, ("Wind_Label", "Bird Behavior (Singing vs Calling) by Wind Strength")),
+]
+OBSERVER_METRICS = {
+    "Total Observations": ("Observation_Count", "Total Observations by Observer", None),
+    "Species Richness": ("Species_Richness", "Species Richness by Observer", None),
+    "Initial Detection Rate": ("Detection_Rate", "Initial Detection Rate by Observer",
+                               "Proportion of Birds Detected in First 3 Minutes"),
+}
+WATCHLIST_CHARTS = [
+    (status_share, ('PIF_Watchlist_Status', 'PIF Watchlist Species Proportion')),
+    (status_species, ('PIF_Watchlist_Status', 'All PIF Watchlist Species (by Observations)')),
+]
+STEWARDSHIP_CHARTS = [
+    (status_share, ('Regional_Stewardship_Status', 'Regional Stewardship Species Proportion')),
+    (status_species, ('Regional_Stewardship_Status', 'All Regional Stewardship Species (by Observations)')),
+]
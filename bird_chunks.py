@@ -0,0 +1,192 @@
+"""Out-of-core aggregation over Parquet chunks.
+
+With ``BIRD_DATA_SOURCE=chunked`` no habitat is ever held in memory whole.
+Every aggregate streams its habitat's Parquet data ``CHUNK_ROWS`` rows at a
+time, reading only the columns it needs, and folds per-chunk partials:
+counts and sums add up, richness merges the distinct (group, species) pairs
+seen in each chunk, and means merge as sum/count.
+
+A habitat source is either an observation CSV (streamed once into its
+Parquet cache) or a directory of Parquet files, such as a habitat partition
+of the bird_ingest store, for multi-season archives.
+"""
+import glob
+import os
+
+import pandas as pd
+
+from bird_data import CHUNK_ROWS, TIME_GROUP_LABELS, observation_cache, typed_chunk
+from bird_schema import CATEGORY_COLUMNS, MONTH_ORDER
+
+# Derived columns and the stored columns they are computed from.
+DERIVED_SOURCES = {
+    'Presence': ['Initial_Three_Min_Cnt'],
+    'End_Hour': ['End_Time'],
+    'Time_Group': ['End_Time'],
+}
+# Partials are re-merged once this many have accumulated, bounding memory.
+MERGE_EVERY = 16
+
+
+# --- Sources ---
+def source_files(source):
+    """Parquet files holding a habitat's observations, in a stable order."""
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '**', '*.parquet'), recursive=True))
+    path = observation_cache(source)
+    if path is None:
+        raise RuntimeError(f"Out-of-core mode needs pyarrow and a writable cache for {source!r}")
+    return [path]
+
+
+def source_version(source):
+    """Change fingerprint of a CSV or a directory of Parquet files."""
+    if os.path.isdir(source):
+        stats = [os.stat(path) for path in source_files(source)]
+        return (len(stats), max((st.st_mtime_ns for st in stats), default=0), sum(st.st_size for st in stats))
+    stat = os.stat(source)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_stats(source):
+    """(mtime, size) of every Parquet file of a directory source."""
+    stats = {path: os.stat(path) for path in source_files(source)}
+    return {path: (st.st_mtime_ns, st.st_size) for path, st in stats.items()}
+
+
+def source_columns(source):
+    import pyarrow.parquet as pq
+
+    columns = []
+    for path in source_files(source):
+        columns += [name for name in pq.ParquetFile(path).schema_arrow.names if name not in columns]
+    return columns + [col for col in DERIVED_SOURCES if col not in columns]
+
+
+def iter_chunks(source, columns, chunk_rows=CHUNK_ROWS, files=None):
+    """Yield typed frames of at most ``chunk_rows`` rows holding ``columns``.
+
+    ``files`` restricts a directory source to some of its Parquet files.
+    """
+    import pyarrow.parquet as pq
+
+    wanted = []
+    for col in columns:
+        for stored in DERIVED_SOURCES.get(col, [col]):
+            if stored not in wanted:
+                wanted.append(stored)
+    for path in source_files(source) if files is None else files:
+        parquet = pq.ParquetFile(path)
+        present = [col for col in wanted if col in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=present):
+            chunk = typed_chunk(batch.to_pandas())
+            yield chunk[[col for col in columns if col in chunk.columns]]
+
+
+def _habitat_chunks(sources, columns):
+    for habitat, source in sources.items():
+        for chunk in iter_chunks(source, columns):
+            yield habitat, chunk
+
+
+# --- Partial Merging ---
+def _plain(index):
+    # Category sets differ between chunks; merge partials on plain values.
+    if isinstance(index, pd.MultiIndex):
+        return index.set_levels([level.astype(object) if isinstance(level, pd.CategoricalIndex) else level
+                                 for level in index.levels])
+    return index.astype(object) if isinstance(index, pd.CategoricalIndex) else index
+
+
+def _fold(partials, merge):
+    """Fold a stream of partials, merging every MERGE_EVERY of them."""
+    pending = []
+    for partial in partials:
+        pending.append(partial)
+        if len(pending) >= MERGE_EVERY:
+            pending = [merge(pd.concat(pending))]
+    return merge(pd.concat(pending)) if pending else None
+
+
+def _typed_keys(frame, keys, habitats):
+    """Give merged group keys the dtypes the in-memory path produces."""
+    for key in keys:
+        if key == 'habitat':
+            frame[key] = pd.Categorical(frame[key], categories=list(habitats))
+        elif key == 'month_name':
+            frame[key] = pd.Categorical(frame[key], categories=MONTH_ORDER, ordered=True)
+        elif key == 'Time_Group':
+            frame[key] = pd.Categorical(frame[key], categories=TIME_GROUP_LABELS, ordered=True)
+        elif key in CATEGORY_COLUMNS:
+            frame[key] = frame[key].astype('category')
+    return frame.set_index(keys).sort_index()
+
+
+def _grouped_partials(sources, dims, columns, where, partial):
+    keys = ['habitat', *dims]
+    needed = list(dict.fromkeys([*dims, *columns, *(col for col, _ in where or ())]))
+    for habitat, chunk in _habitat_chunks(sources, needed):
+        mask = None
+        for column, values in where or ():
+            part = chunk[column].isin(values)
+            mask = part if mask is None else mask & part
+        view = (chunk if mask is None else chunk[mask]).assign(habitat=habitat)
+        result = partial(view, keys)
+        result.index = _plain(result.index)
+        yield result
+
+
+def _finish(merged, keys, sources, name=None):
+    if merged is None:
+        empty = pd.DataFrame(columns=[*keys, 'value'])
+        return _typed_keys(empty, keys, sources)['value'].astype('int64').rename(name)
+    frame = merged.rename('value').reset_index()
+    return _typed_keys(frame, keys, sources)['value'].rename(name)
+
+
+# --- Streamed Aggregates ---
+def count_by(sources, *dims, where=None, dropna=True):
+    keys = ['habitat', *dims]
+    partials = _grouped_partials(sources, dims, [], where,
+                                 lambda view, keys: view.groupby(keys, observed=True, dropna=dropna).size())
+    merged = _fold(partials, lambda part: part.groupby(level=keys, dropna=dropna).sum())
+    return _finish(merged, keys, sources)
+
+
+def richness_by(sources, *dims, where=None):
+    keys = ['habitat', *dims]
+
+    def pairs(view, keys):
+        distinct = view[keys + ['Common_Name']].dropna().drop_duplicates()
+        return distinct.astype({col: object for col in distinct.columns
+                                if isinstance(distinct[col].dtype, pd.CategoricalDtype)}).set_index(keys)
+
+    merged = _fold(_grouped_partials(sources, dims, ['Common_Name'], where, pairs),
+                   lambda part: part.reset_index().drop_duplicates().set_index(keys))
+    if merged is not None:
+        merged = merged.groupby(level=keys).size()
+    return _finish(merged, keys, sources, 'Common_Name')
+
+
+def sum_by(sources, column, *dims, where=None):
+    keys = ['habitat', *dims]
+    partials = _grouped_partials(sources, dims, [column], where,
+                                 lambda view, keys: view.groupby(keys, observed=True)[column].sum())
+    merged = _fold(partials, lambda part: part.groupby(level=keys).sum())
+    return _finish(merged, keys, sources, column)
+
+
+def mean_by(sources, column, *dims, where=None):
+    keys = ['habitat', *dims]
+    partials = _grouped_partials(sources, dims, [column], where,
+                                 lambda view, keys: view.groupby(keys, observed=True)[column].agg(['sum', 'count']))
+    merged = _fold(partials, lambda part: part.groupby(level=keys).sum())
+    if merged is not None:
+        merged = merged['sum'] / merged['count']
+    return _finish(merged, keys, sources, column)
+
+
+def read_columns(source, columns):
+    """Only ``columns`` of a habitat, streamed chunk by chunk into one frame."""
+    chunks = list(iter_chunks(source, columns))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
@@ -0,0 +1,118 @@
+"""Pre-aggregated observation cube with mergeable species-richness bitsets.
+
+Each cell of the cube is one observed combination of ``CUBE_DIMENSIONS`` and
+holds the number of observations plus a bitset of the species seen in it.
+Counts roll up by summing and richness rolls up by OR-ing bitsets, so any
+count/richness chart over a subset of the dimensions is answered from the
+cube without rescanning raw rows.
+"""
+import numpy as np
+import pandas as pd
+
+from bird_species import species_codes
+
+CUBE_DIMENSIONS = [
+    'habitat', 'Admin_Unit_Code', 'Observer', 'Sky', 'Wind_Label', 'ID_Method',
+    'Distance', 'Interval_Length', 'month_name', 'Visit'
+]
+SPECIES_COLUMN = 'Common_Name'  # species ids come from bird_species.species_codes
+# Bump when the cell layout changes so persisted cubes are rebuilt.
+CUBE_VERSION = 2
+
+
+# --- Bitset Helpers ---
+def popcount(bits):
+    """Number of set bits per row of a 2-D uint64 bitset array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(bits).view(np.uint8).reshape(len(bits), -1)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1, dtype=np.int64)
+
+
+def species_bitsets(groups, species_codes, n_groups, n_species):
+    """OR each row's species bit into its group's bitset."""
+    words = max(1, (n_species + 63) // 64)
+    bits = np.zeros((n_groups, words), dtype=np.uint64)
+    codes = np.asarray(species_codes, dtype=np.int64)
+    valid = codes >= 0
+    codes = codes[valid]
+    np.bitwise_or.at(
+        bits,
+        (np.asarray(groups)[valid], codes >> 6),
+        np.left_shift(np.uint64(1), (codes & 63).astype(np.uint64)),
+    )
+    return bits
+
+
+def merge_bitsets(bits, groups, n_groups):
+    """OR together the rows of ``bits`` that share a group id."""
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = np.asarray(groups)[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    merged = np.zeros((n_groups, bits.shape[1]), dtype=np.uint64)
+    if len(order):
+        merged[sorted_groups[starts]] = np.bitwise_or.reduceat(bits[order], starts, axis=0)
+    return merged
+
+
+# --- Cube ---
+class ObservationCube:
+    def __init__(self, cells, bits, species):
+        self.cells = cells
+        self.bits = bits
+        self.species = pd.Index(species)
+
+    @property
+    def dimensions(self):
+        return [col for col in self.cells.columns if col != 'count']
+
+    @classmethod
+    def build(cls, frame, dimensions=CUBE_DIMENSIONS):
+        dims = [dim for dim in dimensions if dim in frame.columns]
+        codes, species = species_codes(frame)
+        # Missing values get cells of their own, so a row lacking one
+        # dimension still counts in rollups over the others.
+        grouped = frame.groupby(dims, observed=True, sort=True, dropna=False)
+        cells = grouped.size().rename('count').reset_index()
+        groups = grouped.ngroup().to_numpy()
+        bits = species_bitsets(groups, codes, len(cells), len(species))
+        return cls(cells, bits, species)
+
+    def covers(self, dims, where=None):
+        available = set(self.dimensions)
+        return set(dims) <= available and all(col in available for col, _ in where or ())
+
+    def rollup(self, dims, where=None):
+        """Observation count and species richness grouped by ``dims``."""
+        dims = list(dims)
+        cells = self.cells
+        bits = self.bits
+        if where:
+            mask = np.ones(len(cells), dtype=bool)
+            for column, values in where:
+                mask &= cells[column].isin(values).to_numpy()
+            cells = cells[mask]
+            bits = bits[mask]
+        # Like a groupby, leave out cells missing any of ``dims``.
+        known = cells[dims].notna().all(axis=1).to_numpy()
+        if not known.all():
+            cells = cells[known]
+            bits = bits[known]
+        grouped = cells.groupby(dims, observed=True, sort=True)
+        result = grouped['count'].sum().to_frame()
+        merged = merge_bitsets(bits, grouped.ngroup().to_numpy(), len(result))
+        result['richness'] = popcount(merged)
+        return result
+
+    # --- Persistence ---
+    def save(self, prefix):
+        self.cells.to_parquet(prefix + '.cells.parquet', index=False)
+        np.save(prefix + '.bits.npy', self.bits)
+        pd.Series(self.species, name=SPECIES_COLUMN).to_frame().to_parquet(prefix + '.species.parquet')
+
+    @classmethod
+    def load(cls, prefix):
+        cells = pd.read_parquet(prefix + '.cells.parquet')
+        bits = np.load(prefix + '.bits.npy')
+        species = pd.read_parquet(prefix + '.species.parquet')[SPECIES_COLUMN]
+        return cls(cells, bits, species)
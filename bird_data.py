@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+
+import pandas as pd
+
+from bird_schema import enforce_schema, format_bytes, frame_bytes, validate_schema
+
+logger = logging.getLogger(__name__)
+
+# --- Derived Columns ---
+# End_Hour bins for the morning survey windows; hours outside them stay NaN.
+TIME_GROUP_BINS = [4, 8, 10]
+TIME_GROUP_LABELS = ['5-8 AM', '8-10 AM']
+
+# Bump when the typed schema changes so stale caches are rebuilt.
+SCHEMA_VERSION = 5
+
+CACHE_DIR = os.environ.get('BIRD_CACHE_DIR', '.bird_cache')
+# Rows per Parquet row group; the observation browser reads one group at a time.
+ROW_GROUP_SIZE = int(os.environ.get('BIRD_ROW_GROUP_SIZE', 4096))
+# Rows per chunk when a CSV is streamed rather than read whole.
+CHUNK_ROWS = int(os.environ.get('BIRD_CHUNK_ROWS', 100_000))
+
+
+# --- Fingerprinting ---
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(path, cache_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return (os.path.join(cache_dir, stem + '.parquet'),
+            os.path.join(cache_dir, stem + '.json'))
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+# --- Typed Parsing ---
+def apply_schema(frame):
+    """Cast raw columns to the declared observation schema and check the result."""
+    return validate_schema(enforce_schema(frame))
+
+
+def add_derived_columns(frame):
+    """Precompute the columns the pages used to write into the shared frame."""
+    if 'Initial_Three_Min_Cnt' in frame.columns:
+        frame['Presence'] = frame['Initial_Three_Min_Cnt'].fillna(False).astype('int8')
+    else:
+        frame['Presence'] = pd.Series(0, index=frame.index, dtype='int8')
+    if 'End_Time' in frame.columns:
+        frame['End_Hour'] = (frame['End_Time'] // 60).astype('Int8')
+        frame['Time_Group'] = pd.cut(frame['End_Hour'], bins=TIME_GROUP_BINS,
+                                     labels=TIME_GROUP_LABELS, right=False)
+    return frame
+
+
+def _read_csv(path):
+    """Typed frame for a CSV plus the bytes its raw parse took."""
+    raw = pd.read_csv(path)
+    raw_bytes = frame_bytes(raw)
+    return add_derived_columns(apply_schema(raw)), raw_bytes
+
+
+def typed_chunk(frame):
+    """Schema-typed frame with derived columns for rows read back from Parquet."""
+    return add_derived_columns(apply_schema(frame))
+
+
+def _log_memory(path, before, after):
+    logger.info("%s: %s raw -> %s typed (%.1fx)", os.path.basename(path),
+                format_bytes(before), format_bytes(after), before / max(after, 1))
+
+
+def prepare_observations(frame):
+    """Type and derive columns for a frame that did not come from a CSV."""
+    return add_derived_columns(apply_schema(frame))
+
+
+# --- Cached Loader ---
+def _cache_is_valid(path, cache_dir):
+    """Whether the Parquet cache of ``path`` matches the CSV's current content.
+
+    The cache is reused while the CSV's mtime and size are unchanged; if only
+    the mtime moved, the content hash decides whether the cache is still valid.
+    """
+    stat = os.stat(path)
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    meta = _read_meta(meta_path)
+    valid = meta is not None and meta.get('schema') == SCHEMA_VERSION and os.path.exists(parquet_path)
+
+    if valid and (meta['mtime_ns'], meta['size']) != (stat.st_mtime_ns, stat.st_size):
+        valid = meta['sha256'] == file_hash(path)
+        if valid:
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            _write_meta(meta_path, meta)
+    return valid
+
+
+def _storable(frame):
+    # Category sets differ from chunk to chunk, so the cache stores plain
+    # values and lets Parquet's dictionary encoding keep them compact.
+    return frame.assign(**{
+        col: frame[col].astype(frame[col].cat.categories.dtype)
+        for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)
+    })
+
+
+def write_observation_cache(path, parquet_path, chunk_rows=CHUNK_ROWS):
+    """Stream a CSV into a typed Parquet file one chunk at a time.
+
+    Peak memory is one chunk regardless of the CSV's size. Returns the bytes
+    the raw (untyped) parse of the whole file took, for the memory report.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    raw_bytes = 0
+    writer = None
+    tmp_path = parquet_path + '.tmp'
+    try:
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            raw_bytes += frame_bytes(chunk)
+            table = pa.Table.from_pandas(_storable(apply_schema(chunk)), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, parquet_path)
+    return raw_bytes
+
+
+def _build_cache(path, cache_dir):
+    """(Re)build the Parquet cache of ``path``; returns False if it cannot be written."""
+    stat = os.stat(path)
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        raw_bytes = write_observation_cache(path, parquet_path)
+    except (ImportError, OSError):
+        return False
+    _write_meta(meta_path, {
+        'schema': SCHEMA_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': file_hash(path),
+        'raw_bytes': raw_bytes,
+    })
+    return True
+
+
+def load_observations(path, cache_dir=CACHE_DIR):
+    """Load an observation CSV through a Parquet cache."""
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    for attempt in range(2):
+        if attempt or not _cache_is_valid(path, cache_dir):
+            if not _build_cache(path, cache_dir):
+                break
+        try:
+            frame = typed_chunk(pd.read_parquet(parquet_path))
+        except (ImportError, OSError, ValueError):
+            continue
+        _log_memory(path, _read_meta(meta_path).get('raw_bytes', 0), frame_bytes(frame))
+        return frame
+
+    # No Parquet engine or read-only checkout: serve the parsed frame uncached.
+    frame, raw_bytes = _read_csv(path)
+    _log_memory(path, raw_bytes, frame_bytes(frame))
+    return frame
+
+
+def observation_cache(path, cache_dir=CACHE_DIR):
+    """Path of the up-to-date Parquet cache for ``path``, building it if needed.
+
+    Returns None when no cache can be written (no Parquet engine or a
+    read-only checkout).
+    """
+    parquet_path, _ = _cache_paths(path, cache_dir)
+    if not _cache_is_valid(path, cache_dir) and not _build_cache(path, cache_dir):
+        return None
+    return parquet_path
+
+
+def _write_meta(meta_path, meta):
+    with open(meta_path, 'w') as fh:
+        json.dump(meta, fh)
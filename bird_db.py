@@ -0,0 +1,308 @@
+"""Pooled database access for MySQL-backed (or SQLite stand-in) datasets.
+
+Configuration comes from the environment:
+
+    BIRD_DB_BACKEND       mysql (default) or sqlite
+    BIRD_DB_HOST / BIRD_DB_PORT / BIRD_DB_USER / BIRD_DB_PASSWORD / BIRD_DB_NAME
+    BIRD_DB_PATH          SQLite database file (sqlite backend only)
+    BIRD_DB_POOL_SIZE     maximum open connections per process (default 5)
+    BIRD_DB_POOL_TIMEOUT  seconds to wait for a free connection (default 30)
+
+Run ``python bird_db.py load`` to copy the habitat CSVs into the database.
+"""
+import argparse
+import contextlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+DB_BACKEND = os.environ.get('BIRD_DB_BACKEND', 'mysql')
+DB_SETTINGS = {
+    'host': os.environ.get('BIRD_DB_HOST', 'localhost'),
+    'port': int(os.environ.get('BIRD_DB_PORT', 3306)),
+    'user': os.environ.get('BIRD_DB_USER', 'root'),
+    'password': os.environ.get('BIRD_DB_PASSWORD', ''),
+    'database': os.environ.get('BIRD_DB_NAME', 'EDA'),
+}
+DB_PATH = os.environ.get('BIRD_DB_PATH', 'bird.sqlite')
+POOL_SIZE = int(os.environ.get('BIRD_DB_POOL_SIZE', 5))
+POOL_TIMEOUT = float(os.environ.get('BIRD_DB_POOL_TIMEOUT', 30))
+# How long a table's change fingerprint is trusted before re-querying.
+VERSION_TTL = float(os.environ.get('BIRD_DB_VERSION_TTL', 60))
+# Surrogate key written by ``load``; the observation browser pages on it.
+ROW_ID_COLUMN = 'Observation_Id'
+
+
+class PoolTimeout(RuntimeError):
+    pass
+
+
+# --- Database Connection ---
+def get_connection(backend=DB_BACKEND):
+    """Open a new, unpooled connection to the configured database."""
+    if backend == 'sqlite':
+        return sqlite3.connect(DB_PATH, check_same_thread=False)
+    import pymysql
+    return pymysql.connect(**DB_SETTINGS)
+
+
+def _is_alive(conn):
+    try:
+        if hasattr(conn, 'ping'):
+            conn.ping(reconnect=True)
+        else:
+            conn.execute('SELECT 1')
+        return True
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """Bounded pool of reusable DB-API connections, shared across sessions.
+
+    Connections are opened lazily up to ``size`` and health-checked before
+    being handed out; a connection that fails the check, or whose block
+    raised, is closed and replaced instead of being returned to the pool.
+    """
+
+    def __init__(self, factory=get_connection, size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 health_check=_is_alive, paramstyle=None):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.health_check = health_check
+        self.paramstyle = paramstyle or ('qmark' if DB_BACKEND == 'sqlite' else 'format')
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def placeholder(self):
+        return '?' if self.paramstyle == 'qmark' else '%s'
+
+    def _acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    return self.factory()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise PoolTimeout(f"No database connection free after {self.timeout}s") from None
+        if not self.health_check(conn):
+            self._discard(conn)
+            return self._acquire()
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    @contextlib.contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            self._discard(conn)
+            raise
+        else:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process-wide pool reused by every Streamlit session."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+
+# --- Query Execution ---
+def execute_query(query, params=None, pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params or ())
+            rows = cursor.fetchall()
+            columns = [col[0] for col in cursor.description or ()]
+        finally:
+            cursor.close()
+    return pd.DataFrame.from_records(list(rows), columns=columns)
+
+
+def read_table(table, pool=None):
+    pool = pool or get_pool()
+    return execute_query(f"SELECT * FROM {quote_identifier(table, pool)}", pool=pool)
+
+
+def quote_identifier(name, pool=None):
+    if not name.replace('_', '').isalnum():
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return f'"{name}"' if pool_backend(pool) == 'sqlite' else f'`{name}`'
+
+
+def pool_backend(pool=None):
+    return 'sqlite' if (pool or get_pool()).paramstyle == 'qmark' else 'mysql'
+
+
+_versions = {}
+# SQLite tables carry triggers that bump their row here on every change.
+VERSION_TABLE = 'bird_versions'
+
+
+def execute_statements(statements, pool=None):
+    """Run ``[(sql, params), ...]`` in one transaction."""
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            for query, params in statements:
+                cursor.execute(query, params or ())
+        finally:
+            cursor.close()
+        conn.commit()
+
+
+def track_changes(table, pool=None, bump=False):
+    """Install a SQLite table's change triggers; ``bump`` also advances its version."""
+    pool = pool or get_pool()
+    versions, name = quote_identifier(VERSION_TABLE, pool), quote_identifier(table, pool)
+    update = f"UPDATE {versions} SET version = version + 1 WHERE table_name = '{table}';"
+    statements = [
+        (f"CREATE TABLE IF NOT EXISTS {versions} (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL)", None),
+        (f"INSERT OR IGNORE INTO {versions} VALUES (?, 0)", (table,)),
+    ]
+    statements += [
+        (f"CREATE TRIGGER IF NOT EXISTS {quote_identifier(f'{table}_{event.lower()}_version', pool)}"
+         f" AFTER {event} ON {name} BEGIN {update} END", None)
+        for event in ('INSERT', 'UPDATE', 'DELETE')
+    ]
+    if bump:
+        statements.append((update, None))
+    execute_statements(statements, pool)
+
+
+def _change_marker(table, pool):
+    """A value that moves whenever a table's rows change.
+
+    On SQLite it is the trigger-kept counter in VERSION_TABLE; on MySQL the
+    table's last update time, or its checksum where the server does not
+    track update times.
+    """
+    if pool_backend(pool) == 'sqlite':
+        track_changes(table, pool)
+        rows = execute_query(f"SELECT version FROM {quote_identifier(VERSION_TABLE, pool)} WHERE table_name = ?",
+                             (table,), pool=pool)
+        return int(rows.iloc[0, 0])
+    rows = execute_query("SELECT UPDATE_TIME FROM information_schema.TABLES"
+                         " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,), pool=pool)
+    updated = rows.iloc[0, 0] if len(rows) else None
+    if updated is not None and not pd.isna(updated):
+        return str(updated)
+    checksum = execute_query(f"CHECKSUM TABLE {quote_identifier(table, pool)}", pool=pool)
+    return ('checksum', int(checksum.iloc[0, 1]))
+
+
+def table_version(table, pool=None):
+    """Change fingerprint for a table, cached for ``VERSION_TTL`` seconds.
+
+    The row count alone misses updates and same-size replacements, so it is
+    paired with a marker that moves on every change (see ``_change_marker``).
+    """
+    now = time.monotonic()
+    cached = _versions.get(table)
+    if cached is not None and now - cached[0] < VERSION_TTL:
+        return cached[1]
+    count = execute_query(f"SELECT COUNT(*) AS n FROM {quote_identifier(table, pool)}", pool=pool)
+    version = ('db', table, int(count.iloc[0, 0]), _change_marker(table, pool))
+    _versions[table] = (now, version)
+    return version
+
+
+# --- Loading CSVs into the database ---
+def _sql_type(dtype, backend):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'DOUBLE' if backend == 'mysql' else 'REAL'
+    return 'VARCHAR(255)' if backend == 'mysql' else 'TEXT'
+
+
+def write_table(frame, table, pool=None, chunk_size=1000, primary_key=None):
+    """Replace ``table`` with the rows of ``frame``."""
+    pool = pool or get_pool()
+    backend = pool_backend(pool)
+    name = quote_identifier(table, pool)
+    columns = ', '.join(f"{quote_identifier(col, pool)} {_sql_type(frame[col].dtype, backend)}"
+                        + (' PRIMARY KEY' if col == primary_key else '')
+                        for col in frame.columns)
+    placeholders = ', '.join([pool.placeholder] * len(frame.columns))
+    rows = frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+        cursor.execute(f"CREATE TABLE {name} ({columns})")
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                cursor.executemany(f"INSERT INTO {name} VALUES ({placeholders})", batch)
+                batch = []
+        if batch:
+            cursor.executemany(f"INSERT INTO {name} VALUES ({placeholders})", batch)
+        cursor.close()
+        conn.commit()
+    if backend == 'sqlite':
+        # Dropping the table dropped its triggers; re-create them and count the reload as a change.
+        track_changes(table, pool, bump=True)
+    _versions.pop(table, None)
+
+
+def main(argv=None):
+    from bird_service import HABITATS, habitat_table
+
+    parser = argparse.ArgumentParser(description="Copy the habitat CSVs into the configured database.")
+    parser.add_argument('command', choices=['load'])
+    parser.add_argument('habitats', nargs='*', default=list(HABITATS))
+    args = parser.parse_args(argv)
+    for habitat in args.habitats:
+        frame = pd.read_csv(HABITATS[habitat])
+        frame.insert(0, ROW_ID_COLUMN, range(1, len(frame) + 1))
+        write_table(frame, habitat_table(habitat), primary_key=ROW_ID_COLUMN)
+        print(f"{habitat}: {len(frame)} rows -> {habitat_table(habitat)}")
+
+
+if __name__ == '__main__':
+    main()
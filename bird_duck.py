@@ -0,0 +1,231 @@
+"""Embedded DuckDB engine for the dashboard aggregates.
+
+With ``BIRD_DATA_SOURCE=duckdb`` every habitat's Parquet data (the CSV caches,
+or a directory of Parquet files) is registered in an in-process DuckDB
+database as one ``observations`` view with a leading ``habitat`` column and
+the derived Presence, End_Hour and Time_Group columns. Each aggregate is a
+single GROUP BY over that view, run on DuckDB's multithreaded vectorized
+engine; no server is involved and no raw rows reach pandas.
+
+    BIRD_DUCKDB_THREADS   worker threads (default: DuckDB's own choice)
+
+``python bird_duck.py check`` runs the dashboard aggregates on both DuckDB
+and the pandas path and reports any that differ.
+"""
+import argparse
+import os
+import threading
+
+import pandas as pd
+
+from bird_chunks import source_files, source_version
+from bird_data import TIME_GROUP_BINS, TIME_GROUP_LABELS
+from bird_sql import type_keys
+
+DUCKDB_THREADS = int(os.environ.get('BIRD_DUCKDB_THREADS', 0))
+VIEW = 'observations'
+
+_database = None
+_database_lock = threading.Lock()
+
+
+# --- Registration ---
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def quote_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _end_hour(field):
+    """End_Hour from however a source stores End_Time."""
+    import pyarrow as pa
+
+    end_time = quote_identifier('End_Time')
+    if field is None:
+        return 'NULL'
+    if pa.types.is_int16(field.type):
+        # Typed caches keep times of day as minutes since midnight.
+        return f"CAST({end_time} // 60 AS INTEGER)"
+    if pa.types.is_integer(field.type):
+        # The ingestion store keeps them as seconds.
+        return f"CAST({end_time} // 3600 AS INTEGER)"
+    if pa.types.is_time(field.type):
+        return f"hour({end_time})"
+    return f"CAST(substr(CAST({end_time} AS VARCHAR), 1, 2) AS INTEGER)"
+
+
+def _time_group(hour):
+    cases = ' '.join(
+        f"WHEN {hour} >= {low} AND {hour} < {high} THEN {quote_literal(label)}"
+        for low, high, label in zip(TIME_GROUP_BINS, TIME_GROUP_BINS[1:], TIME_GROUP_LABELS)
+    )
+    return f"CASE {cases} END"
+
+
+def habitat_select(habitat, source):
+    """SELECT over one habitat's Parquet files with the derived columns added."""
+    import pyarrow.parquet as pq
+
+    files = source_files(source)
+    schema = pq.read_schema(files[0])
+    derived = {
+        'Presence': ("CASE WHEN COALESCE(CAST(" + quote_identifier('Initial_Three_Min_Cnt')
+                     + " AS INTEGER), 0) > 0 THEN 1 ELSE 0 END"
+                     if 'Initial_Three_Min_Cnt' in schema.names else '0'),
+        'End_Hour': _end_hour(schema.field('End_Time') if 'End_Time' in schema.names else None),
+    }
+    derived['Time_Group'] = _time_group(derived['End_Hour'])
+    stored = [name for name in derived if name in schema.names]
+    star = f"* EXCLUDE ({', '.join(map(quote_identifier, stored))})" if stored else '*'
+    columns = ', '.join(f"{expr} AS {quote_identifier(name)}" for name, expr in derived.items())
+    paths = ', '.join(quote_literal(path) for path in files)
+    # The habitat column is set here; a ``habitat=<h>`` directory of the
+    # ingestion store must not add a second one as a hive partition.
+    return (f"SELECT {quote_literal(habitat)} AS habitat, {star}, {columns}"
+            f" FROM read_parquet([{paths}], union_by_name = true, hive_partitioning = false)")
+
+
+def get_database(sources):
+    """DuckDB connection with ``sources`` registered, rebuilt when they change."""
+    import duckdb
+
+    version = tuple((habitat, source, source_version(source)) for habitat, source in sources.items())
+    global _database
+    with _database_lock:
+        if _database is None or _database[0] != version:
+            config = {'threads': DUCKDB_THREADS} if DUCKDB_THREADS > 0 else {}
+            conn = duckdb.connect(':memory:', config=config)
+            selects = [habitat_select(habitat, source) for habitat, source in sources.items()]
+            conn.execute(f"CREATE VIEW {VIEW} AS " + ' UNION ALL BY NAME '.join(selects))
+            if _database is not None:
+                _database[1].close()
+            _database = (version, conn)
+        # Each caller gets its own cursor: DuckDB connections are not
+        # safe to share across threads, cursors on one database are.
+        return _database[1].cursor()
+
+
+# --- Queries ---
+def filter_conditions(where):
+    conditions = []
+    params = []
+    for column, values in where or ():
+        values = list(values)
+        if not values:
+            conditions.append('FALSE')
+            continue
+        conditions.append(f"{quote_identifier(column)} IN ({', '.join(['?'] * len(values))})")
+        params.extend(value.item() if hasattr(value, 'item') else value for value in values)
+    return conditions, params
+
+
+def grouped_query(sources, dims, aggregates, where=None, dropna=True):
+    """Run one ``SELECT habitat, dims, aggregates ... GROUP BY`` over every habitat.
+
+    ``aggregates`` maps output names to SQL aggregate expressions. Returns a
+    frame indexed by ``habitat`` plus ``dims``; with ``dropna`` false, rows
+    missing a dimension are kept as a NULL group.
+    """
+    keys = ['habitat', *dims]
+    conditions, params = filter_conditions(where)
+    if dropna:
+        conditions = [f"{quote_identifier(dim)} IS NOT NULL" for dim in dims] + conditions
+    select = [quote_identifier(key) for key in keys]
+    select += [f"{expr} AS {quote_identifier(name)}" for name, expr in aggregates.items()]
+    query = (f"SELECT {', '.join(select)} FROM {VIEW}"
+             f"{' WHERE ' + ' AND '.join(conditions) if conditions else ''}"
+             f" GROUP BY {', '.join(quote_identifier(key) for key in keys)}")
+    cursor = get_database(sources)
+    try:
+        result = cursor.execute(query, params).df()
+    finally:
+        cursor.close()
+    result['habitat'] = pd.Categorical(result['habitat'], categories=list(sources))
+    result = type_keys(result, dims)
+    return result.set_index(keys).sort_index()
+
+
+# --- Aggregates ---
+def count_by(sources, *dims, where=None, dropna=True):
+    result = grouped_query(sources, dims, {'n': 'COUNT(*)'}, where, dropna)
+    return result['n'].astype('int64').rename(None)
+
+
+def richness_by(sources, *dims, where=None):
+    expr = f"COUNT(DISTINCT {quote_identifier('Common_Name')})"
+    result = grouped_query(sources, dims, {'n': expr}, where)
+    return result['n'].astype('int64').rename('Common_Name')
+
+
+def mean_by(sources, column, *dims, where=None):
+    expr = f"AVG(CAST({quote_identifier(column)} AS DOUBLE))"
+    result = grouped_query(sources, dims, {'v': expr}, where)
+    return result['v'].astype('float64').rename(column)
+
+
+def sum_by(sources, column, *dims, where=None):
+    expr = f"SUM({quote_identifier(column)})"
+    result = grouped_query(sources, dims, {'v': expr}, where)
+    return pd.to_numeric(result['v']).rename(column)
+
+
+# --- Verification ---
+def dashboard_aggregates(habitat):
+    import bird_analysis as ba
+
+    return {
+        'site_richness': ba.site_richness(habitat),
+        'site_counts': ba.site_counts(habitat),
+        'interval_proportions': ba.interval_proportions(habitat),
+        'distance_band_counts': ba.distance_band_counts(habitat),
+        'id_method_totals': ba.id_method_totals(habitat),
+        'visit_totals': ba.visit_totals(habitat),
+        'condition_richness': ba.condition_richness(habitat, 'Sky'),
+        'behavior_by_condition': ba.behavior_by_condition(habitat, 'Wind_Label'),
+        'observer_summary': ba.observer_summary(habitat),
+        'species_month_counts': ba.species_month_counts(habitat),
+        'time_group_counts': ba.time_group_counts(habitat),
+        'priority_species_counts': ba.priority_species_counts(habitat),
+        'watchlist_richness': ba.species_richness(habitat, 'Observer', 'Sky', where=ba.ON_WATCHLIST),
+    }
+
+
+def compare(expected, actual):
+    """Names of the aggregates whose values differ between two runs."""
+    assert_equal = {pd.Series: pd.testing.assert_series_equal, pd.DataFrame: pd.testing.assert_frame_equal}
+    mismatched = []
+    for name, value in expected.items():
+        try:
+            assert_equal[type(value)](value, actual[name], check_dtype=False, check_names=False,
+                                      check_index_type=False, check_categorical=False)
+        except AssertionError:
+            mismatched.append(name)
+    return mismatched
+
+
+def main(argv=None):
+    import bird_service
+
+    parser = argparse.ArgumentParser(description="Check the DuckDB aggregates against the pandas path.")
+    parser.add_argument('command', choices=['check'])
+    parser.add_argument('habitats', nargs='*', default=list(bird_service.HABITATS))
+    args = parser.parse_args(argv)
+    failed = False
+    for habitat in args.habitats:
+        runs = {}
+        for source in ('csv', 'duckdb'):
+            bird_service.DATA_SOURCE = source
+            bird_service.clear_caches()
+            runs[source] = dashboard_aggregates(habitat)
+        mismatched = compare(runs['csv'], runs['duckdb'])
+        failed |= bool(mismatched)
+        print(f"{habitat}: {len(runs['csv']) - len(mismatched)}/{len(runs['csv'])} aggregates match"
+              + (f"; differ: {', '.join(mismatched)}" if mismatched else ''))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
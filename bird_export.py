@@ -0,0 +1,166 @@
+"""Headless export of every dashboard chart for publishing.
+
+Renders the habitat pages' charts (at their default settings, plus every
+view the pages let you switch between) for each habitat to standalone HTML,
+Plotly JSON and/or PNG, without running Streamlit::
+
+    <output>/<habitat>/<chart>.<format>
+
+Charts are fanned out across a process pool. ``manifest.json`` in the output
+directory records, per file, a key of the chart, its parameters and the
+habitat's data version, so re-running only renders charts whose habitat
+changed (e.g. after loading a new season) or whose files are missing.
+HTML files load plotly.js from a shared ``plotly.min.js`` in the output
+directory, so the export works offline. PNG needs the optional ``kaleido``
+package.
+
+Usage::
+
+    python bird_export.py [--output DIR] [--format html json png] [--habitat forest] [--jobs N] [--force]
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+
+import bird_charts as bc
+import bird_service
+from bird_ingest import run_tasks
+
+EXPORT_DIR = os.environ.get('BIRD_EXPORT_DIR', 'bird_export')
+MANIFEST_NAME = 'manifest.json'
+# Bump when chart builders change so every file is re-rendered.
+EXPORT_VERSION = 2
+FORMATS = ('html', 'json', 'png')
+
+
+# --- Chart Catalog ---
+def page_charts():
+    """``[(chart, params), ...]`` of every chart the habitat pages can show, bar per-species ones."""
+    return [
+        (bc.site_richness, ()),
+        (bc.site_counts, ()),
+        *[(bc.interval_proportions, ((group,),)) for group in bc.SPECIES_GROUPS],
+        (bc.distance_bands, ()),
+        (bc.temperature_humidity, ('auto',)),
+        *bc.WIND_CHARTS,
+        *bc.SKY_VIEWS.values(),
+        *[(bc.observer_metric, params) for params in bc.OBSERVER_METRICS.values()],
+        (bc.observer_species, ()),
+        (bc.observer_accumulation, ()),
+        (bc.observer_detection, ()),
+        (bc.adjusted_site_counts, ()),
+        (bc.species_month_heatmap, ()),
+        (bc.time_group_bars, ()),
+        *bc.WATCHLIST_CHARTS,
+        *bc.STEWARDSHIP_CHARTS,
+        (bc.priority_species, ()),
+    ]
+
+
+def chart_name(chart, params):
+    """File stem of a chart: its builder plus its first parameter, e.g. ``condition_counts-Sky``."""
+    if not params:
+        return chart.__name__
+    first = ' '.join(params[0]) if isinstance(params[0], tuple) else str(params[0])
+    return f"{chart.__name__}-{re.sub(r'[^A-Za-z0-9]+', '-', first).strip('-')}"
+
+
+def output_key(habitat, chart, params, fmt):
+    parts = (EXPORT_VERSION, bird_service.DATA_SOURCE, bird_service.habitat_version(habitat),
+             chart.__name__, params, fmt)
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+# --- Rendering ---
+def render_chart(task):
+    """Worker: build one chart and write it in every requested format."""
+    habitat, name, params, targets, output = task
+    fig = getattr(bc, name)(habitat, *params)
+    for fmt, path in targets:
+        target = os.path.join(output, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f'{target}.tmp'
+        if fmt == 'html':
+            script = os.path.relpath(os.path.join(output, 'plotly.min.js'), os.path.dirname(target))
+            fig.write_html(temp, include_plotlyjs=script.replace(os.sep, '/'), full_html=True)
+        elif fmt == 'json':
+            fig.write_json(temp)
+        else:
+            fig.write_image(temp, format='png')
+        os.replace(temp, target)
+    return [path for _, path in targets]
+
+
+def _write_plotly_js(output):
+    from plotly.offline import get_plotlyjs
+
+    path = os.path.join(output, 'plotly.min.js')
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+
+def export_charts(output=EXPORT_DIR, formats=('html',), habitats=None, jobs=None, force=False):
+    """Render every page chart of ``habitats`` into ``output``.
+
+    Returns ``{'written': [...], 'unchanged': [...]}`` of paths relative to
+    ``output``.
+    """
+    if 'png' in formats and importlib.util.find_spec('kaleido') is None:
+        raise RuntimeError("PNG export needs the 'kaleido' package (pip install kaleido)")
+    manifest_path = os.path.join(output, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get('version') != EXPORT_VERSION:
+        manifest = {'version': EXPORT_VERSION, 'files': {}}
+
+    tasks, keys, unchanged = [], {}, []
+    for habitat in habitats or bird_service.HABITATS:
+        for chart, params in page_charts():
+            targets = []
+            for fmt in formats:
+                path = f"{habitat}/{chart_name(chart, params)}.{fmt}"
+                keys[path] = output_key(habitat, chart, params, fmt)
+                if not force and manifest['files'].get(path) == keys[path] \
+                        and os.path.exists(os.path.join(output, path)):
+                    unchanged.append(path)
+                else:
+                    targets.append((fmt, path))
+            if targets:
+                tasks.append((habitat, chart.__name__, params, targets, output))
+
+    os.makedirs(output, exist_ok=True)
+    if 'html' in formats:
+        _write_plotly_js(output)
+    written = [path for paths in run_tasks(render_chart, tasks, jobs) for path in paths]
+    manifest['files'].update({path: keys[path] for path in written})
+    with open(f'{manifest_path}.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+    return {'written': written, 'unchanged': unchanged}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every dashboard chart without Streamlit.")
+    parser.add_argument('--output', default=EXPORT_DIR, help="output directory")
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['html'], dest='formats')
+    parser.add_argument('--habitat', action='append', choices=list(bird_service.HABITATS), dest='habitats',
+                        help="habitat to export (repeatable; default: all)")
+    parser.add_argument('--jobs', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--force', action='store_true', help="re-render files that are up to date")
+    args = parser.parse_args(argv)
+    try:
+        result = export_charts(args.output, args.formats, args.habitats, args.jobs, args.force)
+    except RuntimeError as error:
+        parser.error(str(error))
+    print(f"{args.output}: {len(result['written'])} written, {len(result['unchanged'])} unchanged")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,413 @@
+"""Incremental ingestion of the Bird_Monitoring_Data_*.XLSX survey workbooks.
+
+This is the notebook ETL (bird_grassland.ipynb) as a reusable pipeline. Each
+worksheet is streamed, cleaned and written on its own, with the sheets of all
+workbooks fanned out across a process pool, into a partitioned Parquet store::
+
+    <store>/habitat=<habitat>/<workbook>/<sheet>.parquet
+
+``manifest.json`` in the store records every workbook's hash and every
+sheet's content checksum, so re-running only reprocesses workbooks whose file
+changed and, inside them, only sheets whose content changed. Sheets that
+disappeared from a workbook are dropped from the store.
+
+Usage::
+
+    python bird_ingest.py ingest Bird_Monitoring_Data_*.XLSX [--store DIR] [--jobs N]
+    python bird_ingest.py export grassland [--output grassland_bird.csv]
+
+Outlier capping needs statistics over the whole habitat, so it runs at
+export time rather than per sheet.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from bird_data import file_hash
+from bird_schema import BOOL_COLUMNS
+
+STORE_DIR = os.environ.get('BIRD_STORE_DIR', 'bird_store')
+MANIFEST_NAME = 'manifest.json'
+# Bump when sheet parsing or checksums change so every sheet is reprocessed.
+MANIFEST_VERSION = 3
+WORKBOOK_PATTERN = 'Bird_Monitoring_Data_*.XLSX'
+
+# --- Cleaning Rules (from the notebook) ---
+DROP_COLUMNS = ['Sub_Unit_Code']
+REQUIRED_COLUMNS = ['AcceptedTSN', 'TaxonCode', 'NPSTaxonCode', 'ID_Method']
+FLAG_TRUE = [True, 'True', 'TRUE', 'true']
+FLAG_FALSE = [False, 'False', 'FALSE', 'false']
+# 'Calm (< 1 mph) smoke rises vertically' -> label 'Calm (< 1 mph)', effect 'smoke rises vertically'
+WIND_PATTERN = r'^\s*(?P<desc>[^(]*?)\s*\(\s*(?P<speed>[^)]*?)\s*\)[\s,]*(?P<effect>.*?)\s*$'
+TIME_OF_DAY_COLUMNS = ['Start_Time', 'End_Time']
+OUTLIER_COLUMNS = ['Temperature', 'Humidity']
+OUTLIER_STDS = 3
+
+# Dtypes of a cleaned sheet. Columns not listed here are inferred once and
+# must not be left as Python objects.
+CLEAN_DTYPES = {
+    'Date': 'datetime64[ns]', 'Month': 'int8', 'Visit': 'int16',
+    'Start_Time': 'Int32', 'End_Time': 'Int32',
+    'AcceptedTSN': 'Int64', 'TaxonCode': 'Int64', 'NPSTaxonCode': 'Int64',
+    'Temperature': 'float64', 'Humidity': 'float64',
+    **{col: 'boolean' for col in BOOL_COLUMNS},
+}
+INFERRED_DTYPES = {
+    'string': 'string', 'empty': 'string', 'integer': 'Int64', 'floating': 'float64',
+    'mixed-integer-float': 'float64', 'boolean': 'boolean',
+}
+
+
+def workbook_habitat(path):
+    """Habitat key from a Bird_Monitoring_Data_<HABITAT>.XLSX file name."""
+    match = re.match(r'Bird_Monitoring_Data_(\w+)\.xlsx$', os.path.basename(path), re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"Cannot tell the habitat of {path!r}; pass --habitat")
+    return match.group(1).lower()
+
+
+# --- Typed Parsers ---
+# Survey columns repeat a handful of values, so the text parsers below work on
+# the distinct values and broadcast the result back through the codes.
+def map_distinct(values, parse):
+    """``parse`` applied to each distinct value of ``values`` once."""
+    codes, uniques = pd.factorize(values)
+    parsed = parse(pd.Series(uniques))
+    if isinstance(parsed, pd.DataFrame):
+        return pd.DataFrame({col: parsed[col].array.take(codes, allow_fill=True) for col in parsed},
+                            index=values.index)
+    return pd.Series(parsed.array.take(codes, allow_fill=True), index=values.index)
+
+
+def _flags(values):
+    if pd.api.types.is_string_dtype(values):
+        values = values.str.strip()
+    flags = pd.Series(pd.NA, index=values.index, dtype='boolean')
+    flags[values.isin(FLAG_TRUE)] = True
+    flags[values.isin(FLAG_FALSE)] = False
+    return flags
+
+
+def parse_flags(values):
+    """Nullable booleans from bool cells or 'True'/'False' text."""
+    if pd.api.types.is_bool_dtype(values):
+        return values.astype('boolean')
+    return map_distinct(values, _flags)
+
+
+def _seconds(values):
+    delta = pd.to_timedelta(values.astype('string'), errors='coerce')
+    return delta.dt.total_seconds().astype('Int32')
+
+
+def time_of_day_seconds(values):
+    """Seconds since midnight from Excel times, datetimes or 'HH:MM:SS' text."""
+    if pd.api.types.is_numeric_dtype(values):
+        # Excel stores times as fractions of a day.
+        return (values * 86400).round().astype('Int32')
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return (values - values.dt.normalize()).dt.total_seconds().astype('Int32')
+    return map_distinct(values, _seconds)
+
+
+def format_seconds(values):
+    """'HH:MM:SS' text for integer seconds since midnight."""
+    values = values.astype('Int32')
+    parts = [values // 3600, values % 3600 // 60, values % 60]
+    text = [part.astype('string').str.zfill(2) for part in parts]
+    return text[0] + ':' + text[1] + ':' + text[2]
+
+
+def split_wind(frame):
+    """Split Wind into Wind_Label/Wind_Effect with a single regex extract."""
+    wind = map_distinct(frame['Wind'], lambda values: values.astype('string').str.extract(WIND_PATTERN))
+    frame['Wind_Effect'] = wind['effect']
+    frame['Wind_Label'] = wind['desc'] + ' (' + wind['speed'] + ')'
+    return frame.drop(columns=['Wind'])
+
+
+def apply_clean_dtypes(frame):
+    """Cast to CLEAN_DTYPES and infer a typed dtype for every other column."""
+    casts = {}
+    for col in frame.columns:
+        if col in CLEAN_DTYPES:
+            if frame[col].dtype != CLEAN_DTYPES[col]:
+                casts[col] = frame[col].astype(CLEAN_DTYPES[col])
+        elif frame[col].dtype == object:
+            kind = pd.api.types.infer_dtype(frame[col], skipna=True)
+            if kind in ('datetime', 'datetime64', 'date'):
+                casts[col] = pd.to_datetime(frame[col])
+            else:
+                casts[col] = frame[col].astype(INFERRED_DTYPES.get(kind, 'string'))
+    return frame.assign(**casts)
+
+
+def validate_schema(frame):
+    """Raise ValueError unless ``frame`` matches the cleaned-sheet schema."""
+    problems = [f"{col}: {frame[col].dtype} (expected {CLEAN_DTYPES[col]})"
+                for col in frame.columns
+                if col in CLEAN_DTYPES and frame[col].dtype != CLEAN_DTYPES[col]]
+    problems += [f"{col}: object" for col in frame.columns
+                 if col not in CLEAN_DTYPES and frame[col].dtype == object]
+    if problems:
+        raise ValueError("Cleaned sheet does not match the schema: " + '; '.join(problems))
+    return frame
+
+
+def clean_sheet(frame, sheet):
+    """Apply the notebook's cleaning to one worksheet in a single typed pass."""
+    frame = frame.drop(columns=[col for col in DROP_COLUMNS if col in frame.columns])
+    frame = frame.dropna(subset=[col for col in REQUIRED_COLUMNS if col in frame.columns])
+    frame = frame.reset_index(drop=True).assign(Sheet=sheet)
+    if 'Date' in frame.columns:
+        frame['Date'] = pd.to_datetime(frame['Date'])
+        frame['Month'] = frame['Date'].dt.month
+        frame['month_name'] = frame['Date'].dt.month_name()
+    for col in TIME_OF_DAY_COLUMNS:
+        if col in frame.columns:
+            frame[col] = time_of_day_seconds(frame[col])
+    for col in BOOL_COLUMNS:
+        if col in frame.columns:
+            frame[col] = parse_flags(frame[col])
+    if 'Wind' in frame.columns:
+        frame = split_wind(frame)
+    if 'Distance' in frame.columns:
+        frame['Distance'] = frame['Distance'].ffill()
+    return validate_schema(apply_clean_dtypes(frame))
+
+
+def cap_outliers(frame, columns=OUTLIER_COLUMNS, n_std=OUTLIER_STDS):
+    """Clip each column to mean +/- ``n_std`` standard deviations of itself."""
+    columns = [col for col in columns if col in frame.columns]
+    if not columns:
+        return frame
+    stats = frame[columns].agg(['mean', 'std'])
+    lower = stats.loc['mean'] - n_std * stats.loc['std']
+    upper = stats.loc['mean'] + n_std * stats.loc['std']
+    return frame.assign(**frame[columns].clip(lower, upper, axis=1))
+
+
+def sheet_checksum(frame):
+    """Content checksum of a parsed worksheet, independent of workbook layout."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in frame.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# --- Store and Manifest ---
+def _safe_name(name):
+    return re.sub(r'[^\w.-]', '_', str(name))
+
+
+def partition_path(store, habitat, workbook, sheet):
+    return os.path.join(store, f'habitat={habitat}', _safe_name(workbook), _safe_name(sheet) + '.parquet')
+
+
+def load_manifest(store=STORE_DIR):
+    try:
+        with open(os.path.join(store, MANIFEST_NAME)) as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        manifest = None
+    if manifest is None or manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'workbooks': {}}
+    return manifest
+
+
+def save_manifest(manifest, store=STORE_DIR):
+    # Write then rename so an interrupted run never leaves a torn manifest.
+    path = os.path.join(store, MANIFEST_NAME)
+    os.makedirs(store, exist_ok=True)
+    with open(path + '.tmp', 'w') as fh:
+        json.dump(manifest, fh, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# --- Sheet Workers ---
+def sheet_names(path):
+    from openpyxl import load_workbook
+    book = load_workbook(path, read_only=True)
+    try:
+        return list(book.sheetnames)
+    finally:
+        book.close()
+
+
+def read_sheet(path, sheet):
+    """Parse one worksheet with openpyxl's streaming read-only reader.
+
+    Only this sheet's rows are materialized, so a worker's peak memory is
+    bounded by the largest sheet rather than the whole workbook.
+    """
+    from openpyxl import load_workbook
+    book = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = book[sheet].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = [name if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+        frame = pd.DataFrame.from_records(list(rows), columns=columns)
+    finally:
+        book.close()
+    # Formatted-but-empty trailing rows come back as all-None rows.
+    return frame.dropna(how='all').reset_index(drop=True)
+
+
+def process_sheet(task):
+    """Checksum one sheet and rewrite its partition if the content changed."""
+    path, sheet, habitat, store, previous = task
+    raw = read_sheet(path, sheet)
+    if raw.empty or raw.isna().all().all():
+        return None, 'empty'
+    checksum = sheet_checksum(raw)
+    target = partition_path(store, habitat, os.path.splitext(os.path.basename(path))[0], sheet)
+    if previous is not None and previous['checksum'] == checksum and os.path.exists(target):
+        return previous, 'unchanged'
+    cleaned = clean_sheet(raw, sheet)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    cleaned.to_parquet(target, index=False)
+    return {'checksum': checksum, 'rows': len(cleaned), 'path': os.path.relpath(target, store)}, 'written'
+
+
+def run_tasks(func, tasks, jobs=None):
+    """``map(func, tasks)`` across a process pool, results in task order."""
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        return [func(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(func, tasks))
+
+
+# --- Ingestion ---
+def ingest(paths, store=STORE_DIR, habitat=None, jobs=None):
+    """Bring the store up to date with a set of workbooks.
+
+    Sheets of every changed workbook are fanned out across ``jobs`` worker
+    processes together; results are merged back in workbook and sheet order.
+    Returns one summary dict per workbook listing the sheets written,
+    unchanged and removed.
+    """
+    manifest = load_manifest(store)
+    plans = []
+    tasks = []
+    for path in paths:
+        key = os.path.basename(path)
+        stat = os.stat(path)
+        plan = {
+            'key': key, 'stat': stat, 'sheets': [], 'digest': None,
+            'habitat': habitat or workbook_habitat(path),
+            'entry': manifest['workbooks'].get(key, {'sheets': {}}),
+        }
+        plans.append(plan)
+        entry = plan['entry']
+        same_habitat = entry.get('habitat') == plan['habitat']
+        # An untouched file needs no parsing at all.
+        if same_habitat and (entry.get('mtime_ns'), entry.get('size')) == (stat.st_mtime_ns, stat.st_size):
+            continue
+        plan['digest'] = file_hash(path)
+        if same_habitat and entry.get('sha256') == plan['digest'] and entry['sheets']:
+            continue
+        previous = entry['sheets'] if same_habitat else {}
+        plan['sheets'] = sheet_names(path)
+        tasks += [(path, sheet, plan['habitat'], store, previous.get(sheet))
+                  for sheet in plan['sheets']]
+
+    results = iter(run_tasks(process_sheet, tasks, jobs))
+    summaries = []
+    for plan in plans:
+        entry = plan['entry']
+        summary = {'workbook': plan['key'], 'habitat': plan['habitat'],
+                   'written': [], 'unchanged': [], 'removed': []}
+        if plan['sheets']:
+            sheets = {}
+            for sheet in plan['sheets']:
+                meta, status = next(results)
+                if meta is not None:
+                    sheets[sheet] = meta
+                    summary[status].append(sheet)
+            for sheet, previous in entry['sheets'].items():
+                if sheet not in sheets:
+                    summary['removed'].append(sheet)
+                if sheets.get(sheet, {}).get('path') != previous['path']:
+                    _remove(os.path.join(store, previous['path']))
+            entry = {'habitat': plan['habitat'], 'sheets': sheets}
+        else:
+            summary['unchanged'] = list(entry['sheets'])
+        if plan['digest'] is not None:
+            stat = plan['stat']
+            entry.update(sha256=plan['digest'], mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            manifest['workbooks'][plan['key']] = entry
+        summaries.append(summary)
+    save_manifest(manifest, store)
+    return summaries
+
+
+def ingest_workbook(path, store=STORE_DIR, habitat=None, jobs=None):
+    return ingest([path], store, habitat, jobs)[0]
+
+
+def read_store(habitat, store=STORE_DIR):
+    """Every ingested row of a habitat, in workbook and sheet order."""
+    manifest = load_manifest(store)
+    parts = [
+        pd.read_parquet(os.path.join(store, sheet['path']))
+        for key, entry in sorted(manifest['workbooks'].items())
+        if entry.get('habitat') == habitat
+        for sheet in entry['sheets'].values()
+    ]
+    if not parts:
+        raise KeyError(f"No ingested workbooks for habitat {habitat!r}")
+    return pd.concat(parts, ignore_index=True)
+
+
+def export_csv(habitat, output=None, store=STORE_DIR):
+    """Write the dashboard CSV for a habitat from the store."""
+    frame = cap_outliers(read_store(habitat, store))
+    # The dashboard CSVs keep times of day as 'HH:MM:SS' text.
+    frame = frame.assign(**{col: format_seconds(frame[col])
+                            for col in TIME_OF_DAY_COLUMNS if col in frame.columns})
+    output = output or f'{habitat}_bird.csv'
+    frame.to_csv(output, index=False)
+    return output, len(frame)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally ingest bird monitoring workbooks.")
+    parser.add_argument('--store', default=STORE_DIR, help="partitioned Parquet store directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest_cmd = commands.add_parser('ingest', help="parse new or changed workbook sheets")
+    ingest_cmd.add_argument('workbooks', nargs='*', help=f"defaults to {WORKBOOK_PATTERN} in the current directory")
+    ingest_cmd.add_argument('--habitat', help="habitat key when it is not in the file name")
+    ingest_cmd.add_argument('--jobs', type=int, help="worker processes (default: one per CPU)")
+    export_cmd = commands.add_parser('export', help="write a habitat's dashboard CSV")
+    export_cmd.add_argument('habitat')
+    export_cmd.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    if args.command == 'ingest':
+        paths = args.workbooks or sorted(glob.glob(WORKBOOK_PATTERN))
+        for summary in ingest(paths, args.store, args.habitat, args.jobs):
+            print(f"{summary['workbook']} ({summary['habitat']}): {len(summary['written'])} written, "
+                  f"{len(summary['unchanged'])} unchanged, {len(summary['removed'])} removed")
+    else:
+        output, rows = export_csv(args.habitat, args.output, args.store)
+        print(f"{args.habitat}: {rows} rows -> {output}")
+
+
+if __name__ == '__main__':
+    main()
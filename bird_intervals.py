@@ -0,0 +1,92 @@
+"""Species x interval detection matrix for the "Time of detection" chart.
+
+Counts are held in a dense int64 array with one row per species id and one
+column per Interval_Length code; each column's share is the row's count over
+the column total. New observations are added in place (new species and
+intervals append rows and columns, so existing ids stay stable) and only the
+touched columns are renormalized. Species groups are fixed row-index arrays,
+so selecting groups is a gather on the proportion matrix.
+"""
+import numpy as np
+import pandas as pd
+
+N_SPECIES_GROUPS = 5
+
+
+def _codes(labels, values):
+    """Codes of ``values`` in ``labels``, appending values not seen before."""
+    labels = pd.Index(labels)
+    codes = labels.get_indexer(values)
+    new = codes < 0
+    if new.any():
+        added = pd.Index(pd.unique(values[new]), dtype=object)
+        codes[new] = len(labels) + added.get_indexer(values[new])
+        labels = labels.append(added).rename(labels.name)
+    return labels, codes
+
+
+class IntervalMatrix:
+    def __init__(self, species, intervals, counts):
+        self.species = pd.Index(species, dtype=object, name='Common_Name')
+        self.intervals = pd.Index(intervals, dtype=object, name='Interval_Length')
+        self.counts = np.asarray(counts, dtype=np.int64).reshape(len(self.species), len(self.intervals))
+        self.totals = self.counts.sum(axis=0)
+        self.proportions = np.zeros(self.counts.shape)
+        self._normalize(np.arange(len(self.intervals)))
+
+    @classmethod
+    def from_counts(cls, counts):
+        """Build from a (Common_Name, Interval_Length) indexed count Series."""
+        table = counts.unstack(fill_value=0)
+        return cls(table.index, table.columns, table.to_numpy())
+
+    @classmethod
+    def build(cls, frame):
+        matrix = cls([], [], np.zeros((0, 0)))
+        matrix.add(frame['Common_Name'], frame['Interval_Length'])
+        return matrix
+
+    def _normalize(self, columns):
+        totals = self.totals[columns]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shares = self.counts[:, columns] / totals
+        shares[:, totals == 0] = 0.0
+        self.proportions[:, columns] = shares
+
+    # --- Incremental Update ---
+    def add(self, species, intervals):
+        """Count new observations given as parallel species/interval arrays."""
+        species = np.asarray(species, dtype=object)
+        intervals = np.asarray(intervals, dtype=object)
+        valid = ~(pd.isna(species) | pd.isna(intervals))
+        species, intervals = species[valid], intervals[valid]
+        if not len(species):
+            return self
+        self.species, rows = _codes(self.species, species)
+        self.intervals, cols = _codes(self.intervals, intervals)
+        grow = (len(self.species) - self.counts.shape[0], len(self.intervals) - self.counts.shape[1])
+        if any(grow):
+            self.counts = np.pad(self.counts, ((0, grow[0]), (0, grow[1])))
+            self.proportions = np.pad(self.proportions, ((0, grow[0]), (0, grow[1])))
+            self.totals = np.pad(self.totals, (0, grow[1]))
+        np.add.at(self.counts, (rows, cols), 1)
+        touched = np.unique(cols)
+        np.add.at(self.totals, cols, 1)
+        self._normalize(touched)
+        return self
+
+    # --- Species Groups ---
+    def group_rows(self, n_groups=N_SPECIES_GROUPS):
+        """Row indices of each species group, dealt round-robin by species id."""
+        return [np.arange(start, len(self.species), n_groups) for start in range(n_groups)]
+
+    def take(self, rows):
+        """Species names and proportion rows for the given row indices."""
+        rows = np.asarray(rows, dtype=np.intp)
+        return self.species[rows], self.proportions[rows]
+
+    def copy(self):
+        return IntervalMatrix(self.species, self.intervals, self.counts.copy())
+
+    def to_frame(self):
+        return pd.DataFrame(self.proportions, index=self.species, columns=self.intervals)
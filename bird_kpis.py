@@ -0,0 +1,109 @@
+"""Headline metrics for the Home page.
+
+All metrics come from one observation count grouped by habitat and every
+dimension in ``KPI_GRIDS``, with rows missing a dimension kept as groups of
+their own. Each metric rolls that count up to only the dimensions it needs,
+so a row missing an unrelated column still counts. The result is a plain
+JSON-serializable dict that the dataset service persists per data version.
+"""
+import pandas as pd
+
+from bird_data import TIME_GROUP_BINS, TIME_GROUP_LABELS
+
+# Bump when the metrics change so persisted snapshots are rebuilt.
+KPI_VERSION = 2
+KPI_GRIDS = {
+    'total': (),
+    'observer': ('Observer',),
+    'method': ('ID_Method',),
+    'distance': ('Distance',),
+    'hour': ('End_Hour',),
+    'status': ('Common_Name', 'PIF_Watchlist_Status', 'Regional_Stewardship_Status'),
+}
+KPI_DIMENSIONS = list(dict.fromkeys(dim for dims in KPI_GRIDS.values() for dim in dims))
+NEAR_BAND = '<= 50 Meters'
+MID_BAND = '50 - 100 Meters'
+
+
+# --- Helpers ---
+def _per_habitat(counts):
+    return {str(habitat): int(value) for habitat, value in counts.items()}
+
+
+def _leader(counts, largest=True):
+    """Name and combined count of the largest (or smallest) entry; ties go by name."""
+    if counts.empty:
+        return None, 0
+    ranked = counts.sort_index().sort_values(ascending=not largest, kind='stable')
+    return str(ranked.index[0]), int(ranked.iloc[0])
+
+
+def _habitats_of(grid, level, value):
+    seen = grid[grid.index.get_level_values(level) == value]
+    return sorted(str(habitat) for habitat in seen.index.get_level_values('habitat').unique())
+
+
+def _leads_in(by_habitat, name):
+    """Habitats in which ``name`` is also the largest entry."""
+    return sorted(
+        str(habitat) for habitat, part in by_habitat.groupby(level='habitat', observed=True)
+        if not part.empty and part.droplevel('habitat').idxmax() == name
+    )
+
+
+def _species_counts(grid, mask):
+    return grid[mask].groupby(level='Common_Name', observed=True).sum()
+
+
+# --- Metrics ---
+def compute_kpis(counts, habitats):
+    """Headline metrics from a count indexed by habitat + KPI_DIMENSIONS, missing keys included."""
+    counts = counts[counts > 0]
+    # Grouping on a level drops only the rows missing that metric's dimensions.
+    grids = {name: counts.groupby(level=['habitat', *dims], observed=True).sum()
+             for name, dims in KPI_GRIDS.items()}
+
+    def counts_where(grid, level, value):
+        return _per_habitat(grid[grid.index.get_level_values(level) == value]
+                            .groupby(level='habitat', observed=True).sum())
+
+    observer_counts = grids['observer']
+    observer, observer_count = _leader(observer_counts.groupby(level='Observer', observed=True).sum())
+
+    hours = grids['hour']
+    windows = pd.cut(hours.index.get_level_values('End_Hour').astype(float), bins=TIME_GROUP_BINS,
+                     labels=TIME_GROUP_LABELS, right=False)
+    window_counts = hours.groupby([hours.index.get_level_values('habitat'), windows], observed=True).sum()
+    window_counts.index.names = ['habitat', 'Time_Group']
+    window, window_count = _leader(window_counts.groupby(level='Time_Group', observed=True).sum())
+
+    status = grids['status']
+    level = status.index.get_level_values
+    watchlist = level('PIF_Watchlist_Status').astype(bool)
+    priority = watchlist & level('Regional_Stewardship_Status').astype(bool)
+    priority_name, priority_count = _leader(_species_counts(status, priority))
+
+    # The rarest watchlist species is taken among those seen in every habitat
+    # when there are any, so a single stray record does not win outright.
+    watchlist_counts = _species_counts(status, watchlist)
+    present = status[watchlist].index.to_frame(index=False).groupby('Common_Name', observed=True)['habitat'].nunique()
+    everywhere = watchlist_counts[present.reindex(watchlist_counts.index) == len(habitats)]
+    rare_name, rare_count = _leader(everywhere if not everywhere.empty else watchlist_counts, largest=False)
+
+    return {
+        'habitats': list(habitats),
+        'total_observations': _per_habitat(grids['total'].groupby(level='habitat', observed=True).sum()),
+        'unique_species': _per_habitat(
+            status.index.to_frame(index=False).groupby('habitat', observed=True)['Common_Name'].nunique()),
+        'top_observer': {'name': observer, 'count': observer_count,
+                         'leads_in': _leads_in(observer_counts, observer)},
+        'singing_detections': counts_where(grids['method'], 'ID_Method', 'Singing'),
+        'near_detections': counts_where(grids['distance'], 'Distance', NEAR_BAND),
+        'mid_detections': counts_where(grids['distance'], 'Distance', MID_BAND),
+        'peak_time': {'window': window, 'count': window_count,
+                      'leads_in': _leads_in(window_counts, window)},
+        'priority_species': {'name': priority_name, 'count': priority_count,
+                             'habitats': _habitats_of(status, 'Common_Name', priority_name)},
+        'rarest_watchlist': {'name': rare_name, 'count': rare_count,
+                             'habitats': _habitats_of(status[watchlist], 'Common_Name', rare_name)},
+    }
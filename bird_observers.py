@@ -0,0 +1,142 @@
+"""Observer performance metrics from one grouped pass over coded columns.
+
+Observations are reduced once to cells keyed by ``OBSERVER_KEYS`` (observer,
+species, site, year, month and survey date). Every key column is factorized
+to integer codes, the code rows are grouped in a single ``np.unique`` and
+each cell keeps its number of observations and how many of them were
+detected in the first three minutes. Counts, species richness, detection
+rates with Wilson confidence intervals, observer x species counts and
+species-accumulation curves are all answered from the cells, and any
+site/month/year filter is a mask over them rather than a rescan.
+"""
+import numpy as np
+import pandas as pd
+
+OBSERVER_KEYS = ['Observer', 'Common_Name', 'Admin_Unit_Code', 'Year', 'month_name', 'Date']
+DETECTION_COLUMN = 'Initial_Three_Min_Cnt'
+CONFIDENCE_Z = 1.96
+
+
+def wilson_interval(successes, trials, z=CONFIDENCE_Z):
+    """Wilson score interval of ``successes / trials``, elementwise; NaN where trials is 0."""
+    successes = np.asarray(successes, dtype=float)
+    trials = np.asarray(trials, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = successes / trials
+        centre = (rate + z * z / (2 * trials)) / (1 + z * z / trials)
+        margin = z / (1 + z * z / trials) * np.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials))
+    return centre - margin, centre + margin
+
+
+class ObserverMetrics:
+    def __init__(self, labels, codes, observations, detections, trials):
+        self.labels = labels
+        self.codes = codes
+        self.observations = observations
+        self.detections = detections
+        self.trials = trials
+
+    @classmethod
+    def build(cls, frame):
+        """Group ``frame`` (OBSERVER_KEYS plus the detection column) into cells."""
+        labels, columns = {}, []
+        for key in OBSERVER_KEYS:
+            codes, uniques = pd.factorize(frame[key], sort=True)
+            labels[key] = pd.Index(uniques, name=key)
+            columns.append(codes)
+        stacked = np.column_stack(columns) if columns else np.zeros((0, 0), dtype=np.intp)
+        # Rows missing any key are left out, as a groupby would.
+        complete = (stacked >= 0).all(axis=1)
+        cells, cell = np.unique(stacked[complete], axis=0, return_inverse=True)
+        cell = cell.ravel()
+        detected = frame[DETECTION_COLUMN].to_numpy(dtype=float, na_value=np.nan)[complete]
+        known = ~np.isnan(detected)
+        return cls(
+            labels,
+            pd.DataFrame(cells, columns=OBSERVER_KEYS),
+            np.bincount(cell, minlength=len(cells)),
+            np.bincount(cell, weights=np.where(known, detected > 0, 0), minlength=len(cells)),
+            np.bincount(cell, weights=known, minlength=len(cells)),
+        )
+
+    # --- Filters ---
+    def mask(self, where=None):
+        """Cells matching ((column, values), ...) over any of OBSERVER_KEYS."""
+        keep = np.ones(len(self.codes), dtype=bool)
+        for column, values in where or ():
+            wanted = self.labels[column].get_indexer(list(values))
+            keep &= np.isin(self.codes[column].to_numpy(), wanted[wanted >= 0])
+        return keep
+
+    def _grouped(self, keys, where):
+        """Observation, detection and trial sums per combination of ``keys``."""
+        keep = self.mask(where)
+        codes = self.codes.loc[keep, keys].to_numpy()
+        groups, group = np.unique(codes, axis=0, return_inverse=True)
+        group = group.ravel()
+        sums = [np.bincount(group, weights=values[keep], minlength=len(groups))
+                for values in (self.observations, self.detections, self.trials)]
+        return groups, sums
+
+    def _index(self, keys, groups):
+        if len(keys) == 1:
+            return self.labels[keys[0]].take(groups[:, 0])
+        return pd.MultiIndex.from_arrays([self.labels[key].take(groups[:, i]) for i, key in enumerate(keys)])
+
+    # --- Metrics ---
+    def summary(self, where=None):
+        """Observations, species richness and first-three-minute detection rate with its 95% CI."""
+        groups, (observations, detections, trials) = self._grouped(['Observer'], where)
+        pairs, _ = self._grouped(['Observer', 'Common_Name'], where)
+        richness = np.bincount(np.searchsorted(groups[:, 0], pairs[:, 0]), minlength=len(groups))
+        low, high = wilson_interval(detections, trials)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = detections / trials
+        return pd.DataFrame({
+            'Observation_Count': observations.astype(np.int64),
+            'Species_Richness': richness,
+            'Detection_Rate': rate,
+            'Rate_Low': low,
+            'Rate_High': high,
+        }, index=self._index(['Observer'], groups))
+
+    def species_counts(self, where=None):
+        """Observations per (Observer, Common_Name)."""
+        groups, (observations, _, _) = self._grouped(['Observer', 'Common_Name'], where)
+        return pd.Series(observations.astype(np.int64), index=self._index(['Observer', 'Common_Name'], groups),
+                         name='Count')
+
+    def accumulation(self, where=None):
+        """Per-observer species-accumulation curve over survey dates.
+
+        One row per observer and survey date with the cumulative number of
+        observations and of distinct species recorded up to that date.
+        """
+        keep = self.mask(where)
+        observer = self.codes['Observer'].to_numpy()[keep]
+        species = self.codes['Common_Name'].to_numpy()[keep]
+        date = self.codes['Date'].to_numpy()[keep]
+        # Date codes are sorted, so a species' first record is its smallest code.
+        pairs, pair = np.unique(np.column_stack([observer, species]), axis=0, return_inverse=True)
+        first = np.full(len(pairs), np.iinfo(np.intp).max)
+        np.minimum.at(first, pair.ravel(), date)
+        days, day = np.unique(np.column_stack([observer, date]), axis=0, return_inverse=True)
+        observations = np.bincount(day.ravel(), weights=self.observations[keep], minlength=len(days))
+        new_species = np.bincount(
+            np.searchsorted(days[:, 0] * (len(self.labels['Date']) + 1) + days[:, 1],
+                            pairs[:, 0] * (len(self.labels['Date']) + 1) + first),
+            minlength=len(days))
+        curve = pd.DataFrame({
+            'Observer': self.labels['Observer'].take(days[:, 0]),
+            'Date': self.labels['Date'].take(days[:, 1]),
+            'Observations': observations.astype(np.int64),
+            'Species': new_species,
+        })
+        grouped = curve.groupby('Observer', sort=False)
+        curve['Observations'] = grouped['Observations'].cumsum()
+        curve['Species'] = grouped['Species'].cumsum()
+        return curve
+
+    def values(self, column):
+        """Observed values of a key column, for filter widgets."""
+        return list(self.labels[column])
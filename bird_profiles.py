@@ -0,0 +1,67 @@
+"""Per-species detection profiles for the species drill-down.
+
+A profile holds one species' Presence-weighted detections broken down by
+each of ``PROFILE_DIMENSIONS``. The store is built from one grouped pass:
+species and every dimension are factorized to integer codes and the code
+rows are grouped once into cells holding their records and detections.
+Each dimension's breakdown is then sliced from the cells and split by
+species, so picking a species is a dictionary lookup rather than a scan.
+A record missing one dimension still counts towards the others.
+"""
+import numpy as np
+import pandas as pd
+
+PROFILE_DIMENSIONS = [
+    'ID_Method', 'Distance', 'Interval_Length', 'month_name',
+    'Admin_Unit_Code', 'Sky', 'Wind_Label'
+]
+SPECIES_COLUMN = 'Common_Name'
+DETECTION_COLUMN = 'Initial_Three_Min_Cnt'
+PROFILE_KEYS = [SPECIES_COLUMN, DETECTION_COLUMN]
+
+
+class SpeciesProfiles:
+    def __init__(self, profiles):
+        self.profiles = profiles
+
+    @classmethod
+    def build(cls, frame, dims=PROFILE_DIMENSIONS):
+        """Group ``frame`` (PROFILE_KEYS and ``dims``) once and split it by species."""
+        labels, columns = {}, []
+        for key in [SPECIES_COLUMN, *dims]:
+            codes, uniques = pd.factorize(frame[key], sort=True)
+            labels[key] = pd.Index(uniques, name=key)
+            columns.append(codes)
+        stacked = np.column_stack(columns) if len(frame) else np.zeros((0, len(columns)), dtype=np.intp)
+        # Missing values keep their -1 code so a record is only dropped from
+        # the breakdowns of the dimensions it lacks.
+        cells, cell = np.unique(stacked, axis=0, return_inverse=True)
+        cell = cell.ravel()
+        detected = frame[DETECTION_COLUMN].fillna(False).to_numpy(dtype=bool)
+        records = np.bincount(cell, minlength=len(cells))
+        detections = np.bincount(cell, weights=detected, minlength=len(cells))
+
+        profiles = {}
+        n_species = len(labels[SPECIES_COLUMN])
+        for i, dim in enumerate(dims, start=1):
+            known = (cells[:, 0] >= 0) & (cells[:, i] >= 0)
+            n_levels = len(labels[dim])
+            pair = cells[known, 0] * n_levels + cells[known, i]
+            seen = np.bincount(pair, weights=records[known], minlength=n_species * n_levels) > 0
+            totals = np.bincount(pair, weights=detections[known], minlength=n_species * n_levels)
+            species, level = np.divmod(np.flatnonzero(seen), n_levels)
+            values = totals[seen].astype(np.int64)
+            bounds = np.searchsorted(species, np.arange(n_species + 1))
+            for code in np.unique(species):
+                part = slice(bounds[code], bounds[code + 1])
+                profiles.setdefault(labels[SPECIES_COLUMN][code], {})[dim] = pd.Series(
+                    values[part], index=labels[dim].take(level[part]), name='Detections')
+        return cls(profiles)
+
+    @property
+    def species(self):
+        return sorted(self.profiles)
+
+    def profile(self, species):
+        """``{dim: detections}`` of one species; empty for unseen species."""
+        return self.profiles.get(species, {})
@@ -0,0 +1,395 @@
+"""Data-driven comparative report behind the "Detailed Report" page.
+
+``build_snapshot`` gathers every figure the six report sections quote from
+one batch of habitat-wide aggregates (each computed for all habitats at
+once and mostly answered by the observation cube) into a plain JSON dict.
+The dataset service persists that snapshot per data version, and the
+section writers turn it into blocks that render to Markdown for the page
+or to a standalone HTML file for offline sharing.
+
+    python bird_report.py export report.html
+    python bird_report.py export report.md
+"""
+import argparse
+import html
+import os
+import re
+
+import bird_analysis as ba
+from bird_service import HABITATS, habitat_rows, persisted_json
+
+PARK_NAMES = {
+    'ANTI': 'Antietam National Battlefield',
+    'CATO': 'Catoctin Mountain Park',
+    'CHOH': 'C&O Canal National Historical Park',
+    'GWMP': 'George Washington Memorial Parkway',
+    'HAFE': 'Harpers Ferry National Historical Park',
+    'MANA': 'Manassas National Battlefield Park',
+    'MONO': 'Monocacy National Battlefield',
+    'NACE': 'National Capital Parks-East',
+    'PRWI': 'Prince William Forest Park',
+    'ROCR': 'Rock Creek Park',
+    'WOTR': 'Wolf Trap National Park',
+}
+KEY_SPECIES = 3
+SECTION_TITLES = [
+    "1. Species Frequency and Site Analysis",
+    "2. Species Behavior and Detection Patterns",
+    "3. Environmental Influence",
+    "4. Observer Performance",
+    "5. Temporal Trends",
+    "6. Conservation Insights",
+]
+
+
+# --- Snapshot ---
+def _table(series):
+    """``{habitat: {key: value}}`` of a habitat-indexed aggregate, in index order."""
+    table = {habitat: {} for habitat in HABITATS}
+    for (habitat, key), value in series.items():
+        table[habitat][str(key)] = value.item() if hasattr(value, 'item') else value
+    return table
+
+
+def _by_habitat(series):
+    return {str(habitat): int(value) for habitat, value in zip(series.index.get_level_values('habitat'), series)}
+
+
+def _quartiles(values):
+    return [round(float(q), 1) for q in values.dropna().quantile([0.25, 0.5, 0.75])]
+
+
+def build_snapshot():
+    """Every figure quoted by the report, for all habitats."""
+    species_months = ba.species_month_counts(None)
+    months = _table(species_months.groupby(level=['habitat', 'month_name'], observed=True).sum())
+    peak_species = {}
+    for habitat, counts in months.items():
+        peak = max(counts, key=counts.get) if counts else None
+        in_peak = species_months[(species_months.index.get_level_values('habitat') == habitat)
+                                 & (species_months.index.get_level_values('month_name') == peak)]
+        top = in_peak.droplevel(['habitat', 'month_name']).sort_values(ascending=False, kind='stable')
+        peak_species[habitat] = [str(name) for name in top.index[:KEY_SPECIES]]
+
+    observers = ba.observer_summary(None)
+    climate = {}
+    for habitat in HABITATS:
+        rows = habitat_rows(habitat, ['Temperature', 'Humidity'])
+        climate[habitat] = {'temperature': _quartiles(rows['Temperature']),
+                            'humidity': _quartiles(rows['Humidity'])}
+
+    return {
+        'habitats': list(HABITATS),
+        'site_counts': _table(ba.site_counts(None)),
+        'site_richness': _table(ba.site_richness(None)),
+        'distance': _table(ba.distance_totals(None)),
+        'methods': _table(ba.id_method_totals(None)),
+        'visits': _table(ba.visit_totals(None)),
+        'intervals': _table(ba.condition_counts(None, 'Interval_Length')),
+        'sky_counts': _table(ba.condition_counts(None, 'Sky')),
+        'sky_richness': _table(ba.condition_richness(None, 'Sky')),
+        'wind_counts': _table(ba.condition_counts(None, 'Wind_Label')),
+        'climate': climate,
+        'observer_counts': _table(observers['Observation_Count']),
+        'observer_richness': _table(observers['Species_Richness']),
+        'observer_rates': _table(observers['Detection_Rate']),
+        'months': months,
+        'time_groups': _table(ba.time_group_counts(None).groupby(level=['habitat', 'Time_Group'], observed=True).sum()),
+        'peak_species': peak_species,
+        'richness': _by_habitat(ba.species_richness(None)),
+        'stewardship_richness': _by_habitat(ba.species_richness(None, where=ba.UNDER_STEWARDSHIP)),
+        'stewardship_status': _table(ba.status_counts(None, 'Regional_Stewardship_Status')),
+        'stewardship_species': _table(ba.stewardship_species_counts(None)),
+        'watchlist_species': _table(ba.watchlist_species_counts(None)),
+        'priority_species': _table(ba.priority_species_counts(None)),
+    }
+
+
+def get_snapshot():
+    """The report snapshot for the current data version, persisted as JSON."""
+    return persisted_json('report', build_snapshot)
+
+
+# --- Formatting Helpers ---
+def _ranked(counts, largest=True):
+    """``(key, value)`` pairs by value, ties in key order."""
+    return sorted(counts.items(), key=lambda item: (-item[1] if largest else item[1]))
+
+
+def _site(code):
+    return f"**{PARK_NAMES[code]} ({code})**" if code in PARK_NAMES else f"**{code}**"
+
+
+def _share(part, whole):
+    return f"{part / whole:.0%}" if whole else "n/a"
+
+
+def _series(items, fmt="{:,}"):
+    return ", ".join(f"**{key}** ({fmt.format(value)})" for key, value in items)
+
+
+def _each(snapshot, labels, write):
+    """One subheader and bullet list per habitat."""
+    blocks = []
+    for habitat in snapshot['habitats']:
+        blocks += [('h3', labels[habitat]), ('ul', write(habitat))]
+    return blocks
+
+
+# --- Sections ---
+def site_section(snapshot, labels):
+    counts, richness = snapshot['site_counts'], snapshot['site_richness']
+
+    def write(habitat):
+        by_count = _ranked(counts[habitat])
+        by_richness = _ranked(richness[habitat])
+        if not by_count:
+            return ["No observations."]
+        lowest, low_count = by_count[-1]
+        evenness = _ranked({code: n / richness[habitat][code] for code, n in counts[habitat].items()})
+        items = [f"{' and '.join(_site(code) for code, _ in by_count[:2])} recorded the highest bird counts "
+                 f"({', '.join(f'{n:,}' for _, n in by_count[:2])})."]
+        items.append(f"{_site(by_richness[0][0])} had the highest species richness ({by_richness[0][1]} species).")
+        items.append(f"{_site(lowest)} had the lowest abundance ({low_count:,}) with "
+                     f"{richness[habitat][lowest]} species.")
+        items.append(f"{_site(evenness[0][0])} had the most observations per species "
+                     f"({evenness[0][1]:.1f}), the least even site.")
+        return items
+
+    averages = [
+        f"{labels[habitat]} sites averaged {sum(counts[habitat].values()) / len(counts[habitat]):,.0f} observations "
+        f"and {sum(richness[habitat].values()) / len(richness[habitat]):.0f} species"
+        for habitat in snapshot['habitats'] if counts[habitat]
+    ]
+    richest = max(((habitat, code, n) for habitat in snapshot['habitats'] for code, n in richness[habitat].items()),
+                  key=lambda item: item[2], default=None)
+    comparison = "; ".join(averages) + "."
+    if richest:
+        comparison += f" The richest site overall was {_site(richest[1])} in {labels[richest[0]]} ({richest[2]} species)."
+    return _each(snapshot, labels, write) + [('h3', "🔄 Comparison Insight"), ('p', comparison)]
+
+
+def behavior_section(snapshot, labels):
+    def write(habitat):
+        distance, methods = snapshot['distance'][habitat], _ranked(snapshot['methods'][habitat])
+        intervals, visits = snapshot['intervals'][habitat], snapshot['visits'][habitat]
+        items = []
+        if distance:
+            band, n = _ranked(distance)[0]
+            items.append(f"Most in-band detections were at **{band}** "
+                         f"({n:,}, {_share(n, sum(distance.values()))}).")
+        if methods:
+            items.append(f"**{methods[0][0]}** was the dominant method ({methods[0][1]:,} detections), "
+                         f"followed by {_series(methods[1:])}.")
+        if intervals:
+            first, n = next(iter(intervals.items()))
+            items.append(f"{_share(n, sum(intervals.values()))} of detections came in the first interval (**{first}**).")
+        if visits:
+            items.append("In-band observations by visit: " + _series((f"Visit {v}", n) for v, n in visits.items()) + ".")
+        return items
+
+    shares = []
+    for habitat in snapshot['habitats']:
+        methods = snapshot['methods'][habitat]
+        shares.append(f"{labels[habitat]}: {_share(methods.get('Visualization', 0), sum(methods.values()))} visual, "
+                      f"{_share(methods.get('Singing', 0), sum(methods.values()))} singing")
+    comparison = "Share of detections by method — " + "; ".join(shares) + "."
+    return _each(snapshot, labels, write) + [('h3', "🔄 Comparison Insight"), ('p', comparison)]
+
+
+def environment_section(snapshot, labels):
+    def write(habitat):
+        sky, wind = _ranked(snapshot['sky_counts'][habitat]), _ranked(snapshot['wind_counts'][habitat])
+        sky_richness = _ranked(snapshot['sky_richness'][habitat])
+        temperature, humidity = snapshot['climate'][habitat]['temperature'], snapshot['climate'][habitat]['humidity']
+        items = []
+        if sky and wind:
+            items.append(f"Bird activity peaked under **{sky[0][0]}** skies ({sky[0][1]:,}) "
+                         f"and **{wind[0][0]}** wind ({wind[0][1]:,}).")
+        if sky_richness:
+            items.append(f"Species richness was highest under **{sky_richness[0][0]}** ({sky_richness[0][1]}) "
+                         f"and lowest under **{sky_richness[-1][0]}** ({sky_richness[-1][1]}).")
+        if temperature and humidity:
+            items.append(f"Half of all detections fell between **{temperature[0]}–{temperature[2]} °C** "
+                         f"and **{humidity[0]}–{humidity[2]}% humidity**.")
+        return items
+
+    medians = [
+        f"{labels[habitat]} at {snapshot['climate'][habitat]['temperature'][1]} °C and "
+        f"{snapshot['climate'][habitat]['humidity'][1]}% humidity"
+        for habitat in snapshot['habitats'] if snapshot['climate'][habitat]['temperature']
+    ]
+    comparison = "Median survey conditions: " + "; ".join(medians) + "."
+    return _each(snapshot, labels, write) + [('h3', "🔄 Comparison Insight"), ('p', comparison)]
+
+
+def observer_section(snapshot, labels):
+    counts, richness, rates = snapshot['observer_counts'], snapshot['observer_richness'], snapshot['observer_rates']
+
+    def write(habitat):
+        return [
+            f"**{name}**: {n:,} observations, {richness[habitat][name]} species, "
+            f"{rates[habitat][name]:.0%} detected in the first 3 minutes"
+            for name, n in _ranked(counts[habitat])
+        ]
+
+    leaders = {habitat: _ranked(counts[habitat])[0][0] for habitat in snapshot['habitats'] if counts[habitat]}
+    trailers = {habitat: _ranked(counts[habitat])[-1][0] for habitat in snapshot['habitats'] if counts[habitat]}
+    if len(set(leaders.values())) == 1 and len(set(trailers.values())) == 1:
+        comparison = (f"Observer rankings were consistent across habitats: **{next(iter(leaders.values()))}** "
+                      f"recorded the most observations and **{next(iter(trailers.values()))}** the fewest.")
+    else:
+        comparison = "Observer rankings differed between habitats: " + "; ".join(
+            f"**{name}** led in {labels[habitat]}" for habitat, name in leaders.items()) + "."
+    comparison += " Observer effects should be factored into ecological interpretation."
+    return _each(snapshot, labels, write) + [('h3', "🔄 Comparison Insight"), ('p', comparison)]
+
+
+def temporal_section(snapshot, labels):
+    peaks = {}
+    for habitat in snapshot['habitats']:
+        months, groups = _ranked(snapshot['months'][habitat]), _ranked(snapshot['time_groups'][habitat])
+        peaks[habitat] = (months[0][0] if months else None, groups[0][0] if groups else None)
+
+    def write(habitat):
+        month, window = peaks[habitat]
+        species = ", ".join(f"*{name}*" for name in snapshot['peak_species'][habitat])
+        return [f"Peak Month: **{month}**", f"Peak Time: **{window}**", f"Key Species: {species}"]
+
+    windows = {window for _, window in peaks.values()}
+    months = {month for month, _ in peaks.values()}
+    comparison = (f"Every habitat is most active at **{windows.pop()}**" if len(windows) == 1
+                  else "Peak times of day differ between habitats")
+    comparison += (", and seasonal peaks coincide." if len(months) == 1
+                   else ", but **seasonal peaks differ**, reflecting distinct breeding cycles and habitat cues.")
+    return _each(snapshot, labels, write) + [('h3', "🔄 Comparison Insight"), ('p', comparison)]
+
+
+def rarest_shared_watchlist(snapshot):
+    """Watchlist species with the fewest observations among those seen in every habitat."""
+    tables = [snapshot['watchlist_species'][habitat] for habitat in snapshot['habitats']]
+    shared = set.intersection(*(set(table) for table in tables)) if tables else set()
+    candidates = shared or set().union(*tables)
+    totals = {name: sum(table.get(name, 0) for table in tables) for name in candidates}
+    return _ranked(totals, largest=False)[0] if totals else (None, 0)
+
+
+def conservation_section(snapshot, labels):
+    tables = [snapshot['priority_species'][habitat] for habitat in snapshot['habitats']]
+    shared = sorted(set.intersection(*(set(table) for table in tables))) if tables else []
+
+    def write(habitat):
+        status = snapshot['stewardship_status'][habitat]
+        richness, stewarded = snapshot['richness'][habitat], snapshot['stewardship_richness'].get(habitat, 0)
+        top = _ranked(snapshot['stewardship_species'][habitat])[:2]
+        rare = _ranked(snapshot['watchlist_species'][habitat], largest=False)[:1]
+        items = [f"{_share(richness - stewarded, richness)} of observed species "
+                 f"({_share(status.get('False', 0), sum(status.values()))} of observations) "
+                 f"are **not under regional stewardship**."]
+        if top:
+            items.append("Strongest stewardship presence: " + ", ".join(f"*{name}* ({n:,})" for name, n in top) + ".")
+        if rare:
+            items.append(f"Least detected watchlist species: *{rare[0][0]}* ({rare[0][1]:,}).")
+        return items
+
+    rare, rare_count = rarest_shared_watchlist(snapshot)
+    blocks = [('ul', ["**Shared Priority Species**: " + (", ".join(f"*{name}*" for name in shared) or "none")])]
+    blocks += _each(snapshot, labels, write)
+    if rare:
+        blocks.append(('p', f"🔍 **Concern**: *{rare}* may need focused monitoring "
+                            f"({rare_count:,} observations across all habitats)."))
+    return blocks
+
+
+def conclusion(snapshot, labels):
+    richest = {habitat: _ranked(snapshot['site_richness'][habitat])
+               for habitat in snapshot['habitats'] if snapshot['site_richness'][habitat]}
+    hotspots = ", ".join(ranked[0][0] for ranked in richest.values())
+    weakest = ", ".join(ranked[-1][0] for ranked in richest.values())
+    timing = "; ".join(
+        f"{labels[habitat]}: {_ranked(snapshot['months'][habitat])[0][0]}, "
+        f"{_ranked(snapshot['time_groups'][habitat])[0][0]}"
+        for habitat in snapshot['habitats'] if snapshot['months'][habitat] and snapshot['time_groups'][habitat]
+    )
+    rare, _ = rarest_shared_watchlist(snapshot)
+    text = (f"Conservation resources should prioritize the most species-rich sites ({hotspots}), while the "
+            f"weakest sites ({weakest}) warrant habitat restoration or disturbance mitigation. Surveys are most "
+            f"productive in each habitat's peak month and time window ({timing}). Observer performance varies, "
+            f"so training and pairing with the strongest observers improves consistency.")
+    if rare:
+        text += f" Under-detected watchlist species such as the {rare} require focused monitoring."
+    return [('p', text)]
+
+
+SECTIONS = [site_section, behavior_section, environment_section, observer_section,
+            temporal_section, conservation_section]
+
+
+def report_blocks(snapshot, labels=None):
+    """The whole report as ``(kind, content)`` blocks."""
+    labels = labels or {habitat: habitat.title() for habitat in snapshot['habitats']}
+    names = " vs. ".join(labels[habitat] for habitat in snapshot['habitats'])
+    blocks = [
+        ('h1', f"🦜 Comparative Analysis – {names}"),
+        ('p', "A comprehensive report based on avian survey data across "
+              f"{len(snapshot['habitats'])} habitat types."),
+    ]
+    for title, section in zip(SECTION_TITLES, SECTIONS):
+        blocks += [('h2', title)] + section(snapshot, labels)
+    return blocks + [('h2', "✅ Conclusion")] + conclusion(snapshot, labels)
+
+
+# --- Rendering ---
+HEADINGS = {'h1': 1, 'h2': 2, 'h3': 3}
+
+
+def to_markdown(blocks):
+    lines = []
+    for kind, content in blocks:
+        if kind in HEADINGS:
+            lines += ['#' * HEADINGS[kind] + ' ' + content, '']
+        elif kind == 'ul':
+            lines += [f"- {item}" for item in content] + ['']
+        else:
+            lines += [content, '']
+    return '\n'.join(lines)
+
+
+def _inline_html(text):
+    text = html.escape(text, quote=False)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    return re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
+
+
+def to_html(blocks, title="Bird Monitoring Report"):
+    body = []
+    for kind, content in blocks:
+        if kind in HEADINGS:
+            body.append(f"<{kind}>{_inline_html(content)}</{kind}>")
+        elif kind == 'ul':
+            body.append("<ul>" + "".join(f"<li>{_inline_html(item)}</li>" for item in content) + "</ul>")
+        else:
+            body.append(f"<p>{_inline_html(content)}</p>")
+    return (f"<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head>\n"
+            "<body>\n" + "\n".join(body) + "\n</body>\n</html>\n")
+
+
+def export_report(path, labels=None):
+    """Write the current report to ``path`` as HTML or Markdown, by extension."""
+    blocks = report_blocks(get_snapshot(), labels)
+    text = to_html(blocks) if os.path.splitext(path)[1].lower() in ('.html', '.htm') else to_markdown(blocks)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the comparative habitat report.")
+    parser.add_argument('command', choices=['export'])
+    parser.add_argument('output', help="a .html/.htm file, or Markdown for any other extension")
+    args = parser.parse_args(argv)
+    print(f"report -> {export_report(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Scalable rendering for the temperature/humidity species scatter.
+
+Small frames are drawn point for point; above ``WEBGL_POINTS`` the traces
+switch to WebGL. Larger archives can be reduced on the server first, either
+by a stratified sample that keeps every species and its extreme points or
+by per-species 2-D bins drawn as count-sized markers. Every figure comes
+with the number of points sent and the time it took to build, also stored
+in the figure's ``layout.meta``. The figure is serialized once, by the
+shared figure cache, and its payload size is measured from that JSON.
+
+    BIRD_SCATTER_WEBGL_POINTS   switch to WebGL above this many points (default 5000)
+    BIRD_SCATTER_MAX_POINTS     points kept by 'auto' downsampling (default 20000)
+"""
+import collections
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+WEBGL_POINTS = int(os.environ.get('BIRD_SCATTER_WEBGL_POINTS', 5000))
+MAX_POINTS = int(os.environ.get('BIRD_SCATTER_MAX_POINTS', 20000))
+BINS = 40
+MODES = ('auto', 'points', 'sample', 'bins')
+
+ScatterStats = collections.namedtuple('ScatterStats', ['rows', 'points', 'seconds', 'render_mode'])
+
+
+# --- Reduction ---
+def downsample(frame, x, y, by, max_points=MAX_POINTS, seed=0):
+    """Stratified sample of at most about ``max_points`` rows.
+
+    Each ``by`` group keeps a share proportional to its size (at least one
+    row) plus the rows holding its minimum and maximum ``x`` and ``y``, so
+    rare species and every species' extent survive the cut.
+    """
+    frame = frame.dropna(subset=[x, y])
+    if len(frame) <= max_points:
+        return frame
+    groups = frame.groupby(by, observed=True, sort=False)
+    quota = np.maximum(1, np.floor(groups[x].transform('size') * max_points / len(frame)))
+    draw = pd.Series(np.random.default_rng(seed).random(len(frame)), index=frame.index)
+    keep = draw.groupby(frame[by], observed=True).rank(method='first') <= quota
+    extremes = pd.concat([groups[col].idxmin() for col in (x, y)] + [groups[col].idxmax() for col in (x, y)])
+    keep[extremes.to_numpy()] = True
+    return frame[keep]
+
+
+def bin_points(frame, x, y, by, bins=BINS):
+    """Per-group 2-D histogram: one row per non-empty (group, x bin, y bin).
+
+    Bin edges are shared across groups; each row sits at its bin centre and
+    carries the number of observations in it.
+    """
+    frame = frame.dropna(subset=[x, y])
+    x_edges = np.histogram_bin_edges(frame[x], bins)
+    y_edges = np.histogram_bin_edges(frame[y], bins)
+    x_bin = np.clip(np.searchsorted(x_edges, frame[x], side='right') - 1, 0, bins - 1)
+    y_bin = np.clip(np.searchsorted(y_edges, frame[y], side='right') - 1, 0, bins - 1)
+    counts = frame.groupby([frame[by], x_bin, y_bin], observed=True).size()
+    cells = counts.rename_axis([by, 'x_bin', 'y_bin']).rename('Observations').reset_index()
+    cells[x] = (x_edges[cells['x_bin']] + x_edges[cells['x_bin'] + 1]) / 2
+    cells[y] = (y_edges[cells['y_bin']] + y_edges[cells['y_bin'] + 1]) / 2
+    return cells.drop(columns=['x_bin', 'y_bin'])
+
+
+# --- Figure ---
+def resolve_mode(mode, rows):
+    if mode != 'auto':
+        return mode
+    return 'points' if rows <= MAX_POINTS else 'sample'
+
+
+def scatter_figure(frame, x, y, color, hover_data=None, mode='auto', title=None):
+    """Build the species scatter under a rendering mode; returns (figure, ScatterStats)."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown scatter mode: {mode!r}")
+    start = time.perf_counter()
+    mode = resolve_mode(mode, len(frame))
+    if mode == 'bins':
+        data = bin_points(frame, x, y, color)
+        options = {'size': 'Observations', 'hover_data': ['Observations']}
+    else:
+        data = downsample(frame, x, y, color) if mode == 'sample' else frame
+        options = {'hover_data': hover_data}
+    render_mode = 'webgl' if len(data) > WEBGL_POINTS else 'svg'
+    fig = px.scatter(data, x=x, y=y, color=color, title=title, render_mode=render_mode, **options)
+    stats = ScatterStats(len(frame), len(data), time.perf_counter() - start, render_mode)
+    # Carried in the figure so a cached copy can still report them.
+    fig.update_layout(meta=stats._asdict())
+    return fig, stats
@@ -0,0 +1,235 @@
+"""Declared schema of an observation record and the compact dtypes it maps to.
+
+Every known column has a kind: text becomes dictionary-encoded categoricals,
+flags are nullable booleans, counts and codes use the narrowest integer that
+fits, times of day are nullable Int16 minutes since midnight and dates are
+date32 (pyarrow) days. Missing flags, times and years stay <NA>; present
+values that cannot be parsed are read as missing with a warning.
+``enforce_schema`` casts a raw frame to it and ``validate_schema`` checks the
+result; ``memory_report`` compares a frame's footprint before and after.
+
+    python bird_schema.py report forest_bird.csv grassland_bird.csv
+"""
+import argparse
+import warnings
+
+import pandas as pd
+
+MONTH_ORDER = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+
+OBSERVATION_SCHEMA = {
+    'Observation_Id': 'int32',
+    'Admin_Unit_Code': 'category',
+    'Sub_Unit_Code': 'category',
+    'Site_Name': 'category',
+    'Plot_Name': 'category',
+    'Location_Type': 'category',
+    'Year': 'year',
+    'Date': 'date',
+    'Start_Time': 'minutes',
+    'End_Time': 'minutes',
+    'Observer': 'category',
+    'Visit': 'int8',
+    'Interval_Length': 'category',
+    'ID_Method': 'category',
+    'Distance': 'category',
+    'Flyover_Observed': 'bool',
+    'Sex': 'category',
+    'Common_Name': 'category',
+    'Scientific_Name': 'category',
+    'AcceptedTSN': 'Int32',
+    'TaxonCode': 'Int32',
+    'NPSTaxonCode': 'Int32',
+    'AOU_Code': 'category',
+    'PIF_Watchlist_Status': 'bool',
+    'Regional_Stewardship_Status': 'bool',
+    'Temperature': 'float32',
+    'Humidity': 'float32',
+    'Sky': 'category',
+    'Disturbance': 'category',
+    'Previously_Obs': 'bool',
+    'Initial_Three_Min_Cnt': 'bool',
+    'Sheet': 'category',
+    'Month': 'int8',
+    'month_name': 'month',
+    'Wind_Effect': 'category',
+    'Wind_Label': 'category',
+}
+
+CATEGORY_COLUMNS = [col for col, kind in OBSERVATION_SCHEMA.items() if kind in ('category', 'month')]
+BOOL_COLUMNS = [col for col, kind in OBSERVATION_SCHEMA.items() if kind == 'bool']
+DATE_COLUMNS = [col for col, kind in OBSERVATION_SCHEMA.items() if kind == 'date']
+TIME_COLUMNS = [col for col, kind in OBSERVATION_SCHEMA.items() if kind == 'minutes']
+BOOL_VALUES = {True: True, False: False, 'True': True, 'False': False, '1': True, '0': False, 1: True, 0: False}
+
+
+def date_dtype():
+    """date32 when pyarrow is available, else second-resolution datetimes."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return pd.api.types.pandas_dtype('datetime64[s]')
+    return pd.ArrowDtype(pa.date32())
+
+
+def date_scalar(value, dtype):
+    """``value`` as something comparable with a column of ``dtype``."""
+    value = pd.Timestamp(value)
+    return value.date() if isinstance(dtype, pd.ArrowDtype) else value
+
+
+def month_dtype():
+    return pd.CategoricalDtype(MONTH_ORDER, ordered=True)
+
+
+def expected_dtype(kind):
+    if kind == 'category':
+        return 'category'
+    if kind == 'month':
+        return month_dtype()
+    if kind == 'bool':
+        return pd.api.types.pandas_dtype('boolean')
+    if kind == 'date':
+        return date_dtype()
+    if kind in ('minutes', 'year'):
+        return pd.api.types.pandas_dtype('Int16')
+    return pd.api.types.pandas_dtype(kind)
+
+
+# --- Casting ---
+def _category(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    if pd.api.types.is_string_dtype(values):
+        values = values.str.strip()
+    return values.astype('category')
+
+
+def _report_invalid(values, parsed):
+    """Warn about present values that ``parsed`` left missing."""
+    invalid = values.notna() & parsed.isna()
+    if invalid.any():
+        examples = ', '.join(map(repr, pd.unique(values[invalid])[:3]))
+        warnings.warn(f"{values.name}: {int(invalid.sum())} unrecognized value(s) ({examples}) read as missing",
+                      stacklevel=3)
+    return parsed
+
+
+def _minutes(values):
+    """Minutes since midnight from 'HH:MM:SS' text, timedeltas or seconds; missing stays <NA>."""
+    if pd.api.types.is_timedelta64_dtype(values):
+        delta = values
+    elif pd.api.types.is_numeric_dtype(values):
+        delta = pd.to_timedelta(values, unit='s')
+    else:
+        delta = pd.to_timedelta(values.astype('string'), errors='coerce')
+    return _report_invalid(values, (delta.dt.total_seconds() // 60).astype('Int16'))
+
+
+def _year(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('Int16')
+    return _report_invalid(values, pd.to_datetime(values, errors='coerce').dt.year.astype('Int16'))
+
+
+def _cast(values, kind):
+    if kind == 'category':
+        return _category(values)
+    if kind == 'month':
+        if pd.api.types.is_string_dtype(values):
+            values = values.str.strip()
+        return values.astype(month_dtype())
+    if kind == 'bool':
+        # Databases hand booleans back as 0/1 or 'True'/'False'; missing
+        # flags stay <NA> rather than reading as False.
+        if pd.api.types.is_bool_dtype(values):
+            return values.astype('boolean')
+        return _report_invalid(values, values.map(BOOL_VALUES).astype('boolean'))
+    if kind == 'date':
+        return pd.to_datetime(values).astype(date_dtype())
+    if kind == 'minutes':
+        return _minutes(values)
+    if kind == 'year':
+        return _year(values)
+    return pd.to_numeric(values).astype(kind)
+
+
+def enforce_schema(frame):
+    """Cast ``frame`` to the declared schema.
+
+    Known columns get their declared dtype; any other text column is
+    dictionary-encoded too, so no string columns are left behind.
+    """
+    casts = {}
+    for col in frame.columns:
+        kind = OBSERVATION_SCHEMA.get(col)
+        if kind is None:
+            if pd.api.types.is_string_dtype(frame[col]) or frame[col].dtype == object:
+                casts[col] = _category(frame[col])
+            continue
+        if frame[col].dtype != expected_dtype(kind):
+            casts[col] = _cast(frame[col], kind)
+    return frame.assign(**casts) if casts else frame
+
+
+def validate_schema(frame):
+    """Raise ValueError listing every column that does not match the schema."""
+    problems = [
+        f"{col}: {frame[col].dtype} (expected {expected_dtype(kind)})"
+        for col, kind in OBSERVATION_SCHEMA.items()
+        if col in frame.columns and frame[col].dtype != expected_dtype(kind)
+    ]
+    problems += [f"{col}: {frame[col].dtype}" for col in frame.columns
+                 if col not in OBSERVATION_SCHEMA and frame[col].dtype == object]
+    if problems:
+        raise ValueError("Observation frame does not match the schema: " + '; '.join(problems))
+    return frame
+
+
+# --- Memory Report ---
+def frame_bytes(frame):
+    return int(frame.memory_usage(deep=True, index=False).sum())
+
+
+def memory_report(before, after):
+    """Per-column bytes of ``before`` and ``after`` plus their ratio."""
+    report = pd.DataFrame({
+        'before': before.memory_usage(deep=True, index=False),
+        'after': after.memory_usage(deep=True, index=False),
+    }).astype('Int64')
+    report['dtype'] = after.dtypes.astype(str)
+    report.loc['TOTAL', ['before', 'after']] = [frame_bytes(before), frame_bytes(after)]
+    report['ratio'] = (report['before'] / report['after']).round(1)
+    return report
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report observation memory before and after the schema.")
+    parser.add_argument('command', choices=['report'])
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--object-strings', action='store_true',
+                        help="measure 'before' with Python-object strings, as pandas < 3 loads them")
+    args = parser.parse_args(argv)
+    for path in args.paths:
+        raw = pd.read_csv(path)
+        if args.object_strings:
+            raw = raw.astype({col: object for col in raw.columns if pd.api.types.is_string_dtype(raw[col])})
+        typed = validate_schema(enforce_schema(raw))
+        report = memory_report(raw, typed)
+        print(f"== {path}")
+        print(report.to_string())
+        total = report.loc['TOTAL']
+        print(f"{format_bytes(total['before'])} -> {format_bytes(total['after'])} ({total['ratio']}x)\n")
+
+
+if __name__ == '__main__':
+    main()
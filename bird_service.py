@@ -0,0 +1,562 @@
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from bird_cube import CUBE_VERSION, ObservationCube
+import bird_chunks
+import bird_db
+import bird_duck
+import bird_sql
+from bird_data import CACHE_DIR, SCHEMA_VERSION, apply_schema, load_observations, prepare_observations
+from bird_intervals import IntervalMatrix
+from bird_kpis import KPI_DIMENSIONS, KPI_VERSION, compute_kpis
+from bird_bias import EFFECT_COLUMNS, ObserverEffects
+from bird_observers import DETECTION_COLUMN, OBSERVER_KEYS, ObserverMetrics
+from bird_profiles import PROFILE_DIMENSIONS, PROFILE_KEYS, SpeciesProfiles
+from bird_species import SpeciesIndex
+
+# --- Habitat Registry ---
+DEFAULT_HABITATS = {
+    'forest': 'forest_bird.csv',
+    'grassland': 'grassland_bird.csv',
+}
+
+
+def parse_habitats(spec):
+    """``{habitat: source}`` from ``'forest=path,grassland=path'``."""
+    habitats = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        habitat, sep, source = item.partition('=')
+        if not sep or not habitat.strip() or not source.strip():
+            raise ValueError(f"BIRD_HABITATS entries must look like habitat=source, got {item!r}")
+        habitats[habitat.strip()] = source.strip()
+    return habitats
+
+
+# BIRD_HABITATS replaces the sources above, e.g. with directories of Parquet
+# files for the chunked and duckdb data sources or an ingestion store's
+# habitat=<h> partitions: BIRD_HABITATS=forest=bird_store/habitat=forest,...
+HABITATS = parse_habitats(os.environ['BIRD_HABITATS']) if os.environ.get('BIRD_HABITATS') else dict(DEFAULT_HABITATS)
+
+# 'csv' reads the files above; 'db' reads same-named tables through bird_db;
+# 'chunked' streams the files (or directories of Parquet files) through
+# bird_chunks without ever loading a whole habitat; 'duckdb' queries them
+# with the embedded engine in bird_duck.
+DATA_SOURCE = os.environ.get('BIRD_DATA_SOURCE', 'csv')
+
+AGGREGATE_CACHE_BYTES = int(os.environ.get('BIRD_AGGREGATE_CACHE_BYTES', 256 * 1024 * 1024))
+FIGURE_CACHE_BYTES = int(os.environ.get('BIRD_FIGURE_CACHE_BYTES', 64 * 1024 * 1024))
+
+
+# --- Size-bounded LRU ---
+def object_size(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache that evicts by total payload size in bytes."""
+
+    def __init__(self, max_bytes, sizeof=object_size):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key][0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.total_bytes -= self._items.pop(key)[1]
+            self._items[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+# --- Habitat Frames ---
+_frames = {}
+_frames_lock = threading.Lock()
+_combined = None
+_cube = None
+_species_index = None
+_interval_matrices = {}
+_species_profiles = {}
+_observer_models = {}
+_snapshots = {}
+_aggregates = LRUCache(AGGREGATE_CACHE_BYTES)
+_figures = LRUCache(FIGURE_CACHE_BYTES)
+
+
+def habitat_table(habitat):
+    return os.path.splitext(os.path.basename(HABITATS[habitat]))[0]
+
+
+def habitat_version(habitat):
+    if DATA_SOURCE == 'db':
+        return bird_db.table_version(habitat_table(habitat))
+    return bird_chunks.source_version(HABITATS[habitat])
+
+
+def load_habitat(habitat):
+    if DATA_SOURCE == 'db':
+        return prepare_observations(bird_db.read_table(habitat_table(habitat)))
+    return load_observations(HABITATS[habitat])
+
+
+def data_version():
+    return tuple((habitat, habitat_version(habitat)) for habitat in HABITATS)
+
+
+def get_frame(habitat):
+    """Return the shared, read-only observation frame for a habitat.
+
+    One copy per process is shared by every Streamlit session; it is reloaded
+    only when the underlying CSV or table changes. Callers must not mutate it.
+    """
+    if habitat not in HABITATS:
+        raise KeyError(f"Unknown habitat: {habitat!r}")
+    version = habitat_version(habitat)
+    with _frames_lock:
+        cached = _frames.get(habitat)
+        if cached is None or cached[0] != version:
+            cached = (version, load_habitat(habitat))
+            _frames[habitat] = cached
+    return cached[1]
+
+
+def concat_habitats(frames):
+    """Stack habitat frames under a leading ``habitat`` categorical column.
+
+    Categorical columns are widened to the union of their categories first so
+    the stacked frame keeps compact category dtypes instead of object columns.
+    """
+    frames = dict(frames)
+    columns = {}
+    for frame in frames.values():
+        for col in frame.columns:
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                columns.setdefault(col, []).append(frame[col].dtype)
+    unified = {}
+    for col, dtypes in columns.items():
+        if all(dtype == dtypes[0] for dtype in dtypes):
+            unified[col] = dtypes[0]
+        else:
+            categories = sorted(set().union(*(dtype.categories for dtype in dtypes)))
+            unified[col] = pd.CategoricalDtype(categories)
+    parts = []
+    for habitat, frame in frames.items():
+        widened = {col: frame[col].astype(dtype) for col, dtype in unified.items()
+                   if col in frame.columns and frame[col].dtype != dtype}
+        part = frame.assign(**widened) if widened else frame
+        parts.append(part)
+    combined = pd.concat(parts, ignore_index=True)
+    labels = [habitat for habitat, frame in frames.items() for _ in range(len(frame))]
+    combined.insert(0, 'habitat', pd.Categorical(labels, categories=list(frames)))
+    return combined
+
+
+def get_combined_frame():
+    """Return every habitat stacked in one frame, for single-pass aggregates."""
+    global _combined
+    version = data_version()
+    frames = {habitat: get_frame(habitat) for habitat in HABITATS}
+    with _frames_lock:
+        if _combined is None or _combined[0] != version:
+            _combined = (version, concat_habitats(frames))
+        return _combined[1]
+
+
+def get_cube():
+    """Return the observation cube for the current data version.
+
+    The cube is persisted next to the Parquet caches so a restarted process
+    reuses it instead of rescanning every habitat.
+    """
+    global _cube
+    version = data_version()
+    with _frames_lock:
+        if _cube is not None and _cube[0] == version:
+            return _cube[1]
+    tag = hashlib.sha1(repr((SCHEMA_VERSION, CUBE_VERSION, version)).encode()).hexdigest()[:16]
+    prefix = os.path.join(CACHE_DIR, f'cube-{tag}')
+    try:
+        cube = ObservationCube.load(prefix)
+    except (ImportError, OSError, ValueError):
+        cube = ObservationCube.build(get_combined_frame())
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            for name in os.listdir(CACHE_DIR):
+                if name.startswith('cube-') and not name.startswith(f'cube-{tag}.'):
+                    os.remove(os.path.join(CACHE_DIR, name))
+            cube.save(prefix)
+        except (ImportError, OSError):
+            pass
+    with _frames_lock:
+        _cube = (version, cube)
+    return cube
+
+
+def get_species_index():
+    """Return the species-presence index for the current data version."""
+    global _species_index
+    version = data_version()
+    combined = get_combined_frame()
+    with _frames_lock:
+        if _species_index is None or _species_index[0] != version:
+            _species_index = (version, SpeciesIndex.build(combined))
+        return _species_index[1]
+
+
+def _added_files(habitat, stats):
+    """New Parquet files of a directory source whose other files are unchanged."""
+    source = HABITATS[habitat]
+    if DATA_SOURCE == 'db' or stats is None or not os.path.isdir(source):
+        return None
+    current = bird_chunks.file_stats(source)
+    if any(current.get(path) != stat for path, stat in stats.items()):
+        return None
+    return sorted(set(current) - set(stats))
+
+
+def get_interval_matrix(habitat):
+    """Return the species x interval detection matrix of a habitat.
+
+    When files are only added to a directory source, the rows of the new
+    files are counted into a copy of the previous matrix instead of
+    re-aggregating the habitat.
+    """
+    version = habitat_version(habitat)
+    with _frames_lock:
+        cached = _interval_matrices.get(habitat)
+    if cached is not None and cached[0] == version:
+        return cached[2]
+    source = HABITATS[habitat]
+    stats = bird_chunks.file_stats(source) if DATA_SOURCE != 'db' and os.path.isdir(source) else None
+    added = _added_files(habitat, cached[1]) if cached is not None else None
+    if added is not None:
+        matrix = cached[2].copy()
+        columns = ['Common_Name', 'Interval_Length']
+        for chunk in bird_chunks.iter_chunks(source, columns, files=added):
+            matrix.add(chunk['Common_Name'], chunk['Interval_Length'])
+    else:
+        matrix = IntervalMatrix.from_counts(count_by(habitat, 'Common_Name', 'Interval_Length'))
+    with _frames_lock:
+        _interval_matrices[habitat] = (version, stats, matrix)
+    return matrix
+
+
+def get_species_profiles(habitat, where=None):
+    """Return the per-species detection profiles of a habitat under ``where``.
+
+    Built once per data version from one read of the profile columns,
+    grouped over every species and dimension in a single pass.
+    """
+    version = habitat_version(habitat)
+    key = (habitat, where)
+    with _frames_lock:
+        cached = _species_profiles.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    available = habitat_columns(habitat)
+    dims = [dim for dim in PROFILE_DIMENSIONS if dim in available]
+    columns = PROFILE_KEYS + dims
+    rows = habitat_rows(habitat, list(dict.fromkeys(columns + [column for column, _ in where or ()])))
+    mask = where_mask(rows, where)
+    profiles = SpeciesProfiles.build(rows if mask is None else rows[mask], dims)
+    with _frames_lock:
+        _species_profiles[key] = (version, profiles)
+    return profiles
+
+
+def _observer_model(habitat, model, columns):
+    """Build ``model`` from a habitat's ``columns`` once per data version."""
+    version = habitat_version(habitat)
+    key = (habitat, model.__name__)
+    with _frames_lock:
+        cached = _observer_models.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    built = model.build(habitat_rows(habitat, columns))
+    with _frames_lock:
+        _observer_models[key] = (version, built)
+    return built
+
+
+def get_observer_metrics(habitat):
+    """Return the observer metrics engine of a habitat for its data version.
+
+    Built from one grouped pass over the habitat's observer, species, site
+    and date columns; filtered metrics are then answered from its cells.
+    """
+    return _observer_model(habitat, ObserverMetrics, OBSERVER_KEYS + [DETECTION_COLUMN])
+
+
+def get_observer_effects(habitat):
+    """Return the coded records behind the observer-effect detection model of a habitat."""
+    return _observer_model(habitat, ObserverEffects, EFFECT_COLUMNS)
+
+
+def persisted_json(name, build, format_version=1):
+    """Return ``build()`` for the current data version, persisted as JSON.
+
+    The result is kept in memory and written next to the Parquet caches, so
+    a restarted process reads a small file instead of recomputing it; files
+    of older data versions are removed. Bump ``format_version`` when
+    ``build`` changes so snapshots persisted by older code are rebuilt.
+    """
+    version = (format_version, data_version())
+    with _frames_lock:
+        cached = _snapshots.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    tag = hashlib.sha1(repr((SCHEMA_VERSION, DATA_SOURCE, version)).encode()).hexdigest()[:16]
+    path = os.path.join(CACHE_DIR, f'{name}-{tag}.json')
+    try:
+        with open(path) as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        value = build()
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            for stale in os.listdir(CACHE_DIR):
+                if stale.startswith(f'{name}-') and stale.endswith('.json') and stale != os.path.basename(path):
+                    os.remove(os.path.join(CACHE_DIR, stale))
+            with open(f'{path}.tmp', 'w') as f:
+                json.dump(value, f)
+            os.replace(f'{path}.tmp', path)
+        except OSError:
+            pass
+    with _frames_lock:
+        _snapshots[name] = (version, value)
+    return value
+
+
+def get_kpis():
+    """Return the Home page headline metrics for the current data version.
+
+    Computed from one grouped count over every habitat and persisted as a
+    versioned JSON snapshot, so the landing page does not aggregate at all
+    after the first run.
+    """
+    return persisted_json('kpis', lambda: compute_kpis(
+        count_by(None, *KPI_DIMENSIONS, dropna=False), list(HABITATS)), KPI_VERSION)
+
+
+# --- Memoized Aggregates ---
+def select_habitats(result, habitats):
+    """Slice a habitat-indexed aggregate down to the requested habitats.
+
+    A single habitat key drops the ``habitat`` level; a sequence keeps it and
+    ``None`` returns every habitat.
+    """
+    if habitats is None:
+        return result.copy()
+    if isinstance(habitats, str):
+        if habitats not in HABITATS:
+            raise KeyError(f"Unknown habitat: {habitats!r}")
+        if result.index.nlevels == 1:
+            return result.loc[[habitats]].iloc[0] if habitats in result.index else result.iloc[:0]
+        mask = result.index.get_level_values('habitat') == habitats
+        return result[mask].droplevel('habitat')
+    mask = result.index.get_level_values('habitat').isin(list(habitats))
+    return result[mask]
+
+
+def habitat_tables():
+    return {habitat: habitat_table(habitat) for habitat in HABITATS}
+
+
+def memoized(func=None, *, pushdown=None, chunked=None, duckdb=None):
+    """Memoize an aggregate by (analysis, parameters, data version).
+
+    The wrapped function receives the combined frame of all habitats and must
+    return a result indexed by ``habitat`` first, so every habitat is computed
+    in one pass and cached once. Callers pass a habitat key, a sequence of
+    keys or ``None`` and get back the matching slice.
+
+    With the database data source, ``pushdown`` (a bird_sql function taking
+    the habitat tables instead of the frame) computes the aggregate in the
+    database so the raw rows are never loaded. With the chunked data source,
+    ``chunked`` (a bird_chunks function taking the habitat sources) streams
+    them instead, and with the DuckDB data source ``duckdb`` (its bird_duck
+    counterpart) runs it on the embedded engine.
+    """
+    if func is None:
+        return functools.partial(memoized, pushdown=pushdown, chunked=chunked, duckdb=duckdb)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(habitats, *args, **kwargs):
+        key = (name, DATA_SOURCE, data_version(), args, tuple(sorted(kwargs.items())))
+        result = _aggregates.get(key)
+        if result is None:
+            if DATA_SOURCE == 'db' and pushdown is not None:
+                result = pushdown(habitat_tables(), *args, **kwargs)
+            elif DATA_SOURCE == 'chunked' and chunked is not None:
+                result = chunked(dict(HABITATS), *args, **kwargs)
+            elif DATA_SOURCE == 'duckdb' and duckdb is not None:
+                result = duckdb(dict(HABITATS), *args, **kwargs)
+            else:
+                result = func(get_combined_frame(), *args, **kwargs)
+            _aggregates.put(key, result)
+        return select_habitats(result, habitats)
+
+    return wrapper
+
+
+def habitat_columns(habitat):
+    """Column names available for a habitat, without loading it from a database."""
+    if DATA_SOURCE == 'db':
+        return list(bird_db.execute_query(
+            f"SELECT * FROM {bird_db.quote_identifier(habitat_table(habitat))} LIMIT 0").columns)
+    if DATA_SOURCE in ('chunked', 'duckdb'):
+        return bird_chunks.source_columns(HABITATS[habitat])
+    return list(get_frame(habitat).columns)
+
+
+def habitat_rows(habitat, columns):
+    """Every row of a habitat, but only ``columns`` of it."""
+    if habitat not in HABITATS:
+        raise KeyError(f"Unknown habitat: {habitat!r}")
+    columns = list(columns)
+    if DATA_SOURCE == 'db':
+        select = ', '.join(bird_db.quote_identifier(col) for col in columns)
+        rows = bird_db.execute_query(f"SELECT {select} FROM {bird_db.quote_identifier(habitat_table(habitat))}")
+        return apply_schema(rows)
+    if DATA_SOURCE in ('chunked', 'duckdb'):
+        return bird_chunks.read_columns(HABITATS[habitat], columns)
+    return get_frame(habitat)[columns]
+
+
+def figure_json(analysis, habitat, build, *params):
+    """Serialized Plotly figure for (analysis, habitat, parameters, data version).
+
+    ``build`` is only called on a miss; its figure is stored as JSON in a
+    byte-bounded LRU shared by every session, so an unchanged chart is sent
+    without rebuilding or re-serializing it.
+    """
+    key = (analysis, habitat, params, DATA_SOURCE, data_version())
+    spec = _figures.get(key)
+    if spec is None:
+        import plotly.io as pio
+
+        spec = pio.to_json(build(), validate=False)
+        _figures.put(key, spec)
+    return spec
+
+
+def clear_caches():
+    global _combined, _cube, _species_index
+    with _frames_lock:
+        _frames.clear()
+        _combined = None
+        _cube = None
+        _species_index = None
+        _snapshots.clear()
+        _interval_matrices.clear()
+        _species_profiles.clear()
+        _observer_models.clear()
+    _aggregates.clear()
+    _figures.clear()
+
+
+# --- Filtered Views ---
+def where_mask(frame, where):
+    """Boolean mask for ((column, values), ...) filters, or None for all rows."""
+    mask = None
+    for column, values in where or ():
+        part = frame[column].isin(values)
+        mask = part if mask is None else mask & part
+    return mask
+
+
+def _view(frame, columns, where):
+    # Only the requested columns of the matching rows are materialized.
+    mask = where_mask(frame, where)
+    if mask is None:
+        return frame[columns]
+    return frame.loc[mask, columns]
+
+
+# Counts and richness over cube dimensions are rolled up from the cube and
+# richness filtered on other indexed columns comes from the species index;
+# anything else falls back to scanning the combined frame. ``dropna=False``
+# counts keep rows missing a dimension as a group of their own.
+@memoized(pushdown=bird_sql.count_by, chunked=bird_chunks.count_by,
+          duckdb=bird_duck.count_by)
+def count_by(frame, *dims, where=None, dropna=True):
+    keys = ['habitat', *dims]
+    cube = get_cube()
+    if dropna and cube.covers(keys, where):
+        return cube.rollup(keys, where)['count'].rename(None)
+    return _view(frame, keys, where).groupby(keys, observed=True, dropna=dropna).size()
+
+
+@memoized(pushdown=bird_sql.richness_by, chunked=bird_chunks.richness_by,
+          duckdb=bird_duck.richness_by)
+def richness_by(frame, *dims, where=None):
+    keys = ['habitat', *dims]
+    cube = get_cube()
+    if cube.covers(keys, where):
+        return cube.rollup(keys, where)['richness'].rename('Common_Name')
+    index = get_species_index()
+    if index.covers(tuple((key, ()) for key in keys) + tuple(where or ())):
+        return index.richness_grid(keys, where).rename('Common_Name')
+    view = _view(frame, keys + ['Common_Name'], where)
+    return view.groupby(keys, observed=True)['Common_Name'].nunique()
+
+
+@memoized(pushdown=bird_sql.mean_by, chunked=bird_chunks.mean_by,
+          duckdb=bird_duck.mean_by)
+def mean_by(frame, column, *dims, where=None):
+    keys = ['habitat', *dims]
+    view = _view(frame, keys + [column], where)
+    return view.groupby(keys, observed=True)[column].mean()
+
+
+@memoized(pushdown=bird_sql.sum_by, chunked=bird_chunks.sum_by,
+          duckdb=bird_duck.sum_by)
+def sum_by(frame, column, *dims, where=None):
+    keys = ['habitat', *dims]
+    view = _view(frame, keys + [column], where)
+    return view.groupby(keys, observed=True)[column].sum()
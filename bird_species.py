@@ -0,0 +1,153 @@
+"""Species-presence index for fast cross-filtered richness queries.
+
+Every species gets a dense integer id (its position in the sorted
+``Common_Name`` categories). Rows are laid out grouped by species id and,
+for every value of every indexed dimension, the index keeps a packed row
+bitmap plus the packed bitmap of species seen with that value. A filter is
+answered by AND-ing (across dimensions) and OR-ing (within a dimension) row
+bitmaps and reducing the result to a species bitmap whose popcount is the
+richness. Grids decode each dimension's postings once into per-row value
+codes and group the matching rows' (codes, species) pairs in one pass.
+"""
+import numpy as np
+import pandas as pd
+
+INDEX_DIMENSIONS = [
+    'habitat', 'Admin_Unit_Code', 'Observer', 'Sky', 'Wind_Label', 'ID_Method',
+    'Distance', 'Interval_Length', 'month_name', 'Visit',
+    'PIF_Watchlist_Status', 'Regional_Stewardship_Status'
+]
+
+
+def species_codes(frame):
+    """Dense species ids for every row and the species names they index."""
+    species = frame['Common_Name'].astype('category')
+    return species.cat.codes.to_numpy(), species.cat.categories
+
+
+def bitmap_count(bitmap):
+    """Popcount of a packed uint8 bitmap."""
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(bitmap).sum())
+    return int(np.unpackbits(bitmap).sum())
+
+
+class SpeciesIndex:
+    def __init__(self, species, n_rows, starts, postings, value_species, dtypes=None):
+        self.species = pd.Index(species)
+        self.n_rows = n_rows
+        self.starts = starts
+        self.postings = postings
+        self.value_species = value_species
+        self.dtypes = dtypes or {}
+        self._row_codes = {}
+
+    @classmethod
+    def build(cls, frame, dimensions=INDEX_DIMENSIONS):
+        codes, species = species_codes(frame)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        # First row of each species in the species-sorted layout.
+        starts = np.searchsorted(sorted_codes, np.arange(len(species)))
+
+        postings = {}
+        value_species = {}
+        dtypes = {}
+        for dim in dimensions:
+            if dim not in frame.columns:
+                continue
+            dtypes[dim] = frame[dim].dtype
+            column = frame[dim].to_numpy()[order]
+            postings[dim] = {}
+            value_species[dim] = {}
+            for value in pd.unique(column):
+                if pd.isna(value):
+                    continue
+                rows = column == value
+                postings[dim][value] = np.packbits(rows)
+                value_species[dim][value] = np.packbits(cls._rows_to_species(rows, starts, len(sorted_codes)))
+        return cls(species, len(sorted_codes), starts, postings, value_species, dtypes)
+
+    @staticmethod
+    def _rows_to_species(rows, starts, n_rows):
+        present = np.zeros(len(starts), dtype=bool)
+        has_rows = np.r_[starts[1:], n_rows] > starts
+        if has_rows.any():
+            present[has_rows] = np.logical_or.reduceat(rows, starts[has_rows])
+        return present
+
+    def covers(self, where):
+        return all(col in self.postings for col, _ in where or ())
+
+    def values(self, dim):
+        return list(self.postings[dim])
+
+    # --- Queries ---
+    def row_bitmap(self, where=None):
+        """Packed bitmap of the (species-sorted) rows matching ``where``."""
+        result = None
+        for column, values in where or ():
+            postings = self.postings[column]
+            part = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                if value in postings:
+                    part |= postings[value]
+            result = part if result is None else result & part
+        if result is None:
+            result = np.packbits(np.ones(self.n_rows, dtype=bool))
+        return result
+
+    def species_bitmap(self, where=None):
+        """Packed bitmap of the species seen in rows matching ``where``."""
+        where = tuple(where or ())
+        if len(where) == 1:
+            # Single-dimension filters are unions of the precomputed per-value bitmaps.
+            column, values = where[0]
+            result = np.zeros((len(self.species) + 7) // 8, dtype=np.uint8)
+            for value in values:
+                if value in self.value_species[column]:
+                    result |= self.value_species[column][value]
+            return result
+        rows = np.unpackbits(self.row_bitmap(where), count=self.n_rows).astype(bool)
+        return np.packbits(self._rows_to_species(rows, self.starts, self.n_rows))
+
+    def richness(self, where=None):
+        return bitmap_count(self.species_bitmap(where))
+
+    def row_codes(self, dim):
+        """Per-row position of each row's value in ``values(dim)``; -1 where missing."""
+        codes = self._row_codes.get(dim)
+        if codes is None:
+            codes = np.full(self.n_rows, -1, dtype=np.int32)
+            for i, value in enumerate(self.postings[dim].values()):
+                codes[np.unpackbits(value, count=self.n_rows).astype(bool)] = i
+            self._row_codes[dim] = codes
+        return codes
+
+    def richness_grid(self, dims, where=None):
+        """Richness for every observed combination of ``dims`` under ``where``."""
+        dims = list(dims)
+        rows = np.unpackbits(self.row_bitmap(where), count=self.n_rows).astype(bool)
+        # Species id of every row in the species-sorted layout.
+        species = np.searchsorted(self.starts, np.flatnonzero(rows), side='right') - 1
+        codes = [self.row_codes(dim)[rows] for dim in dims]
+        known = (species >= 0) & np.all([code >= 0 for code in codes], axis=0)
+        # One mixed-radix key per row: the dims' value codes, then the species.
+        sizes = [len(self.postings[dim]) for dim in dims]
+        combo = np.zeros(int(known.sum()), dtype=np.int64)
+        for code, size in zip(codes, sizes):
+            combo = combo * size + code[known]
+        pairs = np.unique(combo * len(self.species) + species[known])
+        combos, values = np.unique(pairs // len(self.species), return_counts=True)
+        digits = []
+        for size in reversed(sizes):
+            combos, digit = np.divmod(combos, size)
+            digits.append(digit)
+        combos = np.column_stack(digits[::-1]) if digits else np.zeros((len(values), 0), dtype=np.int64)
+        # Keep the source dtypes so categorical levels sort like a groupby would.
+        levels = pd.DataFrame({dim: pd.Series(self.values(dim), dtype=object).take(combos[:, i]).to_numpy()
+                               for i, dim in enumerate(dims)})
+        levels = levels.astype({dim: self.dtypes[dim] for dim in dims if dim in self.dtypes})
+        result = pd.Series(values, index=pd.MultiIndex.from_frame(levels),
+                           name='Species_Richness', dtype='int64')
+        return result.sort_index()
@@ -0,0 +1,139 @@
+"""SQL pushdown for the dashboard aggregates on database-backed datasets.
+
+Each function mirrors one of the dataset service's aggregate primitives: it
+builds a parameterized GROUP BY query per habitat table, runs it through the
+pooled ``execute_query`` and returns only the aggregate, indexed by
+``habitat`` first like the pandas path. Derived columns (Presence, End_Hour,
+Time_Group) are computed as SQL expressions so raw rows never leave the
+database.
+"""
+import pandas as pd
+
+from bird_data import TIME_GROUP_BINS, TIME_GROUP_LABELS
+from bird_db import execute_query, get_pool, pool_backend, quote_identifier
+from bird_schema import BOOL_COLUMNS, BOOL_VALUES, CATEGORY_COLUMNS, MONTH_ORDER
+
+
+# --- Expressions ---
+def _end_hour(pool):
+    end_time = quote_identifier('End_Time', pool)
+    if pool_backend(pool) == 'sqlite':
+        # CSV-loaded tables keep times as 'HH:MM:SS' text
+        return f"CAST(substr({end_time}, 1, 2) AS INTEGER)"
+    return f"HOUR({end_time})"
+
+
+def _time_group(pool):
+    hour = _end_hour(pool)
+    cases = ' '.join(
+        f"WHEN {hour} >= {low} AND {hour} < {high} THEN '{label}'"
+        for low, high, label in zip(TIME_GROUP_BINS, TIME_GROUP_BINS[1:], TIME_GROUP_LABELS)
+    )
+    return f"CASE {cases} END"
+
+
+def column_expr(column, pool):
+    if column == 'Presence':
+        return f"CASE WHEN {quote_identifier('Initial_Three_Min_Cnt', pool)} > 0 THEN 1 ELSE 0 END"
+    if column == 'End_Hour':
+        return _end_hour(pool)
+    if column == 'Time_Group':
+        return _time_group(pool)
+    return quote_identifier(column, pool)
+
+
+def filter_conditions(where, pool):
+    """SQL conditions and parameters for a ((column, values), ...) filter spec."""
+    conditions = []
+    params = []
+    for column, values in where or ():
+        values = list(values)
+        if not values:
+            conditions.append('1 = 0')
+            continue
+        marks = ', '.join([pool.placeholder] * len(values))
+        conditions.append(f"{column_expr(column, pool)} IN ({marks})")
+        params.extend(value.item() if hasattr(value, 'item') else value for value in values)
+    return conditions, params
+
+
+def where_clause(dims, where, pool, dropna=True):
+    """WHERE clause and parameters for the group keys and a filter spec.
+
+    With ``dropna`` false, rows missing a group key are kept as a NULL group.
+    """
+    conditions, params = filter_conditions(where, pool)
+    if dropna:
+        conditions = [f"{column_expr(dim, pool)} IS NOT NULL" for dim in dims] + conditions
+    return (' WHERE ' + ' AND '.join(conditions)) if conditions else '', params
+
+
+# --- Result Typing ---
+def type_keys(result, dims):
+    """Give the key columns the same dtypes the pandas path produces."""
+    for dim in dims:
+        if dim == 'month_name':
+            result[dim] = pd.Categorical(result[dim], categories=MONTH_ORDER, ordered=True)
+        elif dim == 'Time_Group':
+            result[dim] = pd.Categorical(result[dim], categories=TIME_GROUP_LABELS, ordered=True)
+        elif dim in CATEGORY_COLUMNS:
+            result[dim] = result[dim].astype('category')
+        elif dim in BOOL_COLUMNS:
+            # Databases hand flags back as 0/1; the other backends key on booleans.
+            result[dim] = result[dim].map(BOOL_VALUES).astype('boolean')
+    return result
+
+
+def grouped_query(tables, dims, aggregates, where=None, pool=None, dropna=True):
+    """Run ``SELECT dims, aggregates ... GROUP BY dims`` on every habitat table.
+
+    ``aggregates`` maps output names to SQL aggregate expressions. Returns a
+    frame indexed by ``habitat`` plus ``dims``.
+    """
+    pool = pool or get_pool()
+    dims = list(dims)
+    select = [f"{column_expr(dim, pool)} AS {quote_identifier(dim, pool)}" for dim in dims]
+    select += [f"{expr} AS {quote_identifier(name, pool)}" for name, expr in aggregates.items()]
+    clause, params = where_clause(dims, where, pool, dropna)
+    group = (' GROUP BY ' + ', '.join(column_expr(dim, pool) for dim in dims)) if dims else ''
+
+    parts = []
+    for habitat, table in tables.items():
+        query = f"SELECT {', '.join(select)} FROM {quote_identifier(table, pool)}{clause}{group}"
+        part = execute_query(query, params, pool=pool)
+        part.insert(0, 'habitat', habitat)
+        parts.append(part)
+    result = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['habitat', *dims, *aggregates])
+    result['habitat'] = pd.Categorical(result['habitat'], categories=list(tables))
+    result = type_keys(result, dims)
+    # Habitats with no matching rows still come back as a single NULL row
+    # when there are no group keys.
+    result = result.dropna(subset=list(aggregates), how='all')
+    return result.set_index(['habitat', *dims]).sort_index()
+
+
+# --- Pushed-down Aggregates ---
+def count_by(tables, *dims, where=None, dropna=True, pool=None):
+    result = grouped_query(tables, dims, {'n': 'COUNT(*)'}, where, pool, dropna)
+    return result['n'].astype('int64').rename(None)
+
+
+def richness_by(tables, *dims, where=None, pool=None):
+    pool = pool or get_pool()
+    expr = f"COUNT(DISTINCT {quote_identifier('Common_Name', pool)})"
+    result = grouped_query(tables, dims, {'n': expr}, where, pool)
+    return result['n'].astype('int64').rename('Common_Name')
+
+
+def mean_by(tables, column, *dims, where=None, pool=None):
+    pool = pool or get_pool()
+    expr = f"AVG({column_expr(column, pool)} * 1.0)"
+    result = grouped_query(tables, dims, {'v': expr}, where, pool)
+    return result['v'].astype('float64').rename(column)
+
+
+def sum_by(tables, column, *dims, where=None, pool=None):
+    pool = pool or get_pool()
+    expr = f"SUM({column_expr(column, pool)})"
+    result = grouped_query(tables, dims, {'v': expr}, where, pool)
+    return pd.to_numeric(result['v']).rename(column)
@@ -0,0 +1,75 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Keep the Parquet caches and snapshots of the test data out of the working tree.
+os.environ.setdefault('BIRD_CACHE_DIR', tempfile.mkdtemp(prefix='bird-cache-'))
+
+import bird_chunks  # noqa: E402
+import bird_db  # noqa: E402
+import bird_duck  # noqa: E402
+import bird_ingest  # noqa: E402
+import bird_service  # noqa: E402
+
+SAMPLE_ROWS = 600
+
+
+@pytest.fixture
+def sample_csvs(tmp_path):
+    """``{habitat: csv}`` of the first rows of each habitat file."""
+    paths = {}
+    for habitat, source in bird_service.DEFAULT_HABITATS.items():
+        path = tmp_path / f'{habitat}_bird.csv'
+        pd.read_csv(os.path.join(ROOT, source), nrows=SAMPLE_ROWS).to_csv(path, index=False)
+        paths[habitat] = str(path)
+    return paths
+
+
+@pytest.fixture
+def use_source(monkeypatch):
+    """Point the dataset service at ``{habitat: source}`` under a data source."""
+    def use(data_source, habitats):
+        monkeypatch.setattr(bird_service, 'DATA_SOURCE', data_source)
+        for habitat in list(bird_service.HABITATS):
+            monkeypatch.delitem(bird_service.HABITATS, habitat)
+        for habitat, source in habitats.items():
+            monkeypatch.setitem(bird_service.HABITATS, habitat, source)
+        bird_service.clear_caches()
+        bird_duck._database = None
+
+    yield use
+    bird_service.clear_caches()
+    bird_duck._database = None
+
+
+@pytest.fixture
+def sqlite_pool(tmp_path, monkeypatch):
+    """SQLite connection pool installed as the process-wide database pool."""
+    path = str(tmp_path / 'bird.sqlite')
+    pool = bird_db.ConnectionPool(factory=lambda: sqlite3.connect(path, check_same_thread=False),
+                                  paramstyle='qmark')
+    monkeypatch.setattr(bird_db, '_pool', pool)
+    monkeypatch.setattr(bird_db, '_versions', {})
+    yield pool
+    pool.close()
+
+
+
+@pytest.fixture
+def store_dirs(sample_csvs, tmp_path):
+    """``{habitat: directory}`` laid out like the ingestion store's partitions."""
+    store = str(tmp_path / 'store')
+    dirs = {}
+    for habitat, csv in sample_csvs.items():
+        target = bird_ingest.partition_path(store, habitat, 'sample.xlsx', 'Sheet1')
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy(bird_chunks.source_files(csv)[0], target)
+        dirs[habitat] = os.path.dirname(os.path.dirname(target))
+    return dirs
@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+import pytest
+
+import bird_analysis as ba
+import bird_db
+
+STATUS_COLUMNS = ['PIF_Watchlist_Status', 'Regional_Stewardship_Status']
+
+
+def _backend_results(use_source, sources, analysis):
+    results = {}
+    for data_source in ('csv', 'chunked', 'duckdb'):
+        use_source(data_source, sources)
+        results[data_source] = analysis()
+    return results
+
+
+def load_sqlite(sources, pool):
+    tables = {}
+    for habitat, csv in sources.items():
+        frame = pd.read_csv(csv)
+        frame.insert(0, bird_db.ROW_ID_COLUMN, range(1, len(frame) + 1))
+        bird_db.write_table(frame, f'{habitat}_bird', pool=pool, primary_key=bird_db.ROW_ID_COLUMN)
+        tables[habitat] = f'{habitat}_bird.csv'
+    return tables
+
+
+@pytest.mark.parametrize('column', STATUS_COLUMNS)
+def test_status_counts_match_across_backends(sample_csvs, use_source, sqlite_pool, column):
+    results = _backend_results(use_source, sample_csvs, lambda: ba.status_counts(None, column))
+    use_source('db', load_sqlite(sample_csvs, sqlite_pool))
+    results['db'] = ba.status_counts(None, column)
+
+    expected = results.pop('csv')
+    key_dtype = expected.index.get_level_values(column).dtype
+    assert pd.api.types.is_bool_dtype(key_dtype)
+    for data_source, result in results.items():
+        pd.testing.assert_series_equal(result, expected, check_names=False, check_index_type=False,
+                                       obj=data_source)
+        assert result.index.get_level_values(column).dtype == key_dtype, data_source
+
+
+
+def test_duckdb_reads_ingest_store_partitions(sample_csvs, store_dirs, use_source):
+    assert all(os.path.basename(path) == f'habitat={habitat}' for habitat, path in store_dirs.items())
+    use_source('csv', sample_csvs)
+    expected = ba.count_by(None, 'Sky')
+    use_source('duckdb', store_dirs)
+    result = ba.count_by(None, 'Sky')
+    pd.testing.assert_series_equal(result, expected, check_names=False, check_index_type=False)
+    assert list(result.index.get_level_values('habitat').unique()) == list(store_dirs)
+
+
+def test_db_source_sees_same_size_updates(sample_csvs, use_source, sqlite_pool, monkeypatch):
+    monkeypatch.setattr(bird_db, 'VERSION_TTL', 0)
+    use_source('db', load_sqlite(sample_csvs, sqlite_pool))
+    before = ba.count_by('forest', 'Sky')
+    changed = bird_db.execute_query('SELECT "Observation_Id", "Sky" FROM "forest_bird" WHERE "Sky" != ? LIMIT 5',
+                                    ('Fog',), pool=sqlite_pool)
+    bird_db.execute_statements([('UPDATE "forest_bird" SET "Sky" = ? WHERE "Observation_Id" = ?', ('Fog', int(row_id)))
+                                for row_id in changed['Observation_Id']], sqlite_pool)
+
+    after = ba.count_by('forest', 'Sky')
+    assert after.sum() == before.sum()
+    assert after['Fog'] == before.get('Fog', 0) + len(changed)
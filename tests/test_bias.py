@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bird_bias import POOLED, ObserverEffects
+
+RATES = {'Ann': 0.08, 'Bo': 0.2, 'Cy': 0.5}
+AVAILABILITY = 0.7
+INTERVALS = [(0, 2.5, '0-2.5 min'), (2.5, 5, '2.5 - 5 min'), (5, 7.5, '5 - 7.5 min'), (7.5, 10, '7.5 - 10 min')]
+
+
+def simulate(seed=7, plots=80, years=(2018, 2019), species=30, pool=12):
+    """Two visits per plot and year, each by a random observer with a known detection rate."""
+    rng = np.random.default_rng(seed)
+    observers = list(RATES)
+    rows = []
+    for plot in range(plots):
+        for year in years:
+            present = rng.choice(species, size=pool, replace=False)
+            for visit in (1, 2):
+                observer = observers[rng.integers(len(observers))]
+                available = present[rng.random(pool) < AVAILABILITY]
+                times = rng.exponential(1 / RATES[observer], size=len(available))
+                for name, time in zip(available, times):
+                    if time >= 10:
+                        continue
+                    label = next(label for low, high, label in INTERVALS if low <= time < high)
+                    rows.append({
+                        'Observer': observer, 'Plot_Name': f'P{plot:03d}', 'Visit': visit,
+                        'Common_Name': f'S{name:02d}', 'Admin_Unit_Code': f'U{plot % 4}', 'Year': year,
+                        'month_name': 'June', 'Interval_Length': label, 'Initial_Three_Min_Cnt': time < 3,
+                    })
+    return pd.DataFrame(rows)
+
+
+def test_fit_recovers_known_detection_probabilities():
+    fit = ObserverEffects.build(simulate()).fit()
+    for observer, rate in RATES.items():
+        truth = 1 - np.exp(-rate * 10)
+        row = fit.loc[observer]
+        assert row['Detection'] == pytest.approx(truth, abs=0.05), observer
+        assert row['Detection_Low'] <= truth <= row['Detection_High'], observer
+    assert fit.loc[POOLED, 'Availability'] == pytest.approx(AVAILABILITY, abs=0.08)
+
+
+def test_surveys_of_different_years_are_not_merged():
+    frame = simulate()
+    effects = ObserverEffects.build(frame)
+    one_year = ObserverEffects.build(frame[frame['Year'] == 2018])
+    # Fitting the 2018 surveys alone must give the same trials as filtering the archive to 2018.
+    by_filter = effects.fit(where=(('Year', (2018,)),))
+    alone = one_year.fit()
+    pd.testing.assert_series_equal(by_filter['Repeat_Trials'], alone['Repeat_Trials'])
+    # Across both years every survey's repeat trials belong to its own observer.
+    trials = effects.fit()['Repeat_Trials']
+    assert trials.drop(POOLED).sum() == trials[POOLED]
+    assert trials[POOLED] == alone['Repeat_Trials'][POOLED] + ObserverEffects.build(
+        frame[frame['Year'] == 2019]).fit()['Repeat_Trials'][POOLED]
+
+
+def test_unknown_early_flags_only_leave_the_time_likelihood():
+    frame = simulate()
+    blanked = frame.astype({'Initial_Three_Min_Cnt': 'boolean'})
+    blanked.loc[::5, 'Initial_Three_Min_Cnt'] = pd.NA
+    full, partial = ObserverEffects.build(frame).fit(), ObserverEffects.build(blanked).fit()
+    known = blanked[blanked['Initial_Three_Min_Cnt'].notna()].groupby('Observer').size()
+    assert partial['Records'].drop(POOLED).to_dict() == known.to_dict()
+    pd.testing.assert_series_equal(partial['Repeat_Trials'], full['Repeat_Trials'])
+    pd.testing.assert_series_equal(partial['Redetections'], full['Redetections'])
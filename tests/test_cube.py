@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from bird_cube import ObservationCube
+
+
+def test_rows_missing_a_dimension_stay_in_the_cube():
+    frame = pd.DataFrame({
+        'habitat': pd.Categorical(['forest'] * 4),
+        'Sky': pd.Categorical(['Fog', np.nan, 'Fog', 'Clear']),
+        'Observer': pd.Categorical(['Ann', 'Ann', np.nan, 'Bo']),
+        'Common_Name': ['Wren', 'Jay', 'Wren', 'Crow'],
+    })
+    cube = ObservationCube.build(frame)
+    totals = cube.rollup(['habitat'])
+    assert totals['count'].tolist() == [4]
+    assert totals['richness'].tolist() == [3]
+    by_sky = cube.rollup(['habitat', 'Sky'])['count'].droplevel('habitat')
+    assert by_sky.to_dict() == {'Clear': 1, 'Fog': 2}
+    by_observer = cube.rollup(['habitat', 'Observer'], where=(('Sky', ('Fog',)),))['count'].droplevel('habitat')
+    assert by_observer.to_dict() == {'Ann': 1}
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+import bird_service
+from bird_kpis import MID_BAND, NEAR_BAND
+from test_backends import load_sqlite
+
+
+def _blank_dimensions(sample_csvs):
+    raw = pd.read_csv(sample_csvs['forest']).astype({'PIF_Watchlist_Status': object})
+    raw.loc[0, ['Sky', 'Observer', 'ID_Method']] = np.nan
+    raw.loc[1, ['Distance', 'Wind_Label', 'End_Time']] = np.nan
+    raw.loc[2, ['Common_Name', 'PIF_Watchlist_Status']] = np.nan
+    raw.to_csv(sample_csvs['forest'], index=False)
+    return raw
+
+
+def test_rows_missing_a_dimension_still_count(sample_csvs, use_source):
+    raw = _blank_dimensions(sample_csvs)
+    use_source('csv', sample_csvs)
+
+    kpis = bird_service.get_kpis()
+    assert kpis['total_observations']['forest'] == len(raw)
+    assert kpis['unique_species']['forest'] == raw['Common_Name'].nunique()
+    assert kpis['near_detections']['forest'] == (raw['Distance'] == NEAR_BAND).sum()
+    assert kpis['mid_detections']['forest'] == (raw['Distance'] == MID_BAND).sum()
+    assert kpis['singing_detections']['forest'] == (raw['ID_Method'] == 'Singing').sum()
+
+
+def test_kpis_match_across_backends(sample_csvs, use_source, sqlite_pool):
+    _blank_dimensions(sample_csvs)
+    results = {}
+    for data_source in ('csv', 'chunked', 'duckdb'):
+        use_source(data_source, sample_csvs)
+        results[data_source] = bird_service.get_kpis()
+    use_source('db', load_sqlite(sample_csvs, sqlite_pool))
+    results['db'] = bird_service.get_kpis()
+
+    for data_source, kpis in results.items():
+        assert kpis == results['csv'], data_source
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bird_service
+from bird_observers import DETECTION_COLUMN, OBSERVER_KEYS, wilson_interval
+
+WHERES = [
+    None,
+    (('Admin_Unit_Code', ['ANTI']), ('month_name', ['May']), ('Year', [2018])),
+    (('Admin_Unit_Code', ['ANTI', 'CATO']), ('month_name', ['June'])),
+    (('Year', [2017]),),
+]
+
+
+@pytest.fixture
+def observations(sample_csvs, use_source):
+    """The forest sample, with some flags unknown, and its observer metrics."""
+    raw = pd.read_csv(sample_csvs['forest']).astype({DETECTION_COLUMN: object})
+    raw.loc[::7, DETECTION_COLUMN] = np.nan
+    raw.to_csv(sample_csvs['forest'], index=False)
+    use_source('csv', sample_csvs)
+    frame = bird_service.get_frame('forest').dropna(subset=OBSERVER_KEYS)
+    return frame, bird_service.get_observer_metrics('forest')
+
+
+def _filtered(frame, where):
+    for column, values in where or ():
+        frame = frame[frame[column].isin(values)]
+    return frame
+
+
+@pytest.mark.parametrize('where', WHERES)
+def test_summary_matches_groupby(observations, where):
+    frame, metrics = observations
+    view = _filtered(frame, where)
+    grouped = view.groupby('Observer', observed=True)
+    detections = grouped[DETECTION_COLUMN].sum()
+    trials = grouped[DETECTION_COLUMN].count()
+    low, high = wilson_interval(detections, trials)
+    expected = pd.DataFrame({
+        'Observation_Count': grouped.size(),
+        'Species_Richness': grouped['Common_Name'].nunique(),
+        'Detection_Rate': grouped[DETECTION_COLUMN].mean().astype(float),
+        'Rate_Low': low,
+        'Rate_High': high,
+    })
+    pd.testing.assert_frame_equal(metrics.summary(where), expected, check_dtype=False,
+                                  check_index_type=False, check_categorical=False)
+
+
+@pytest.mark.parametrize('where', WHERES)
+def test_species_counts_match_groupby(observations, where):
+    frame, metrics = observations
+    expected = _filtered(frame, where).groupby(['Observer', 'Common_Name'], observed=True).size()
+    assert metrics.species_counts(where).to_dict() == expected.to_dict()
+
+
+@pytest.mark.parametrize('where', WHERES)
+def test_accumulation_matches_cumulative_nunique(observations, where):
+    frame, metrics = observations
+    view = _filtered(frame, where)
+    expected = []
+    for (observer, date), _ in view.groupby(['Observer', 'Date'], observed=True):
+        seen = view[(view['Observer'] == observer) & (view['Date'] <= date)]
+        expected.append((observer, date, len(seen), seen['Common_Name'].nunique()))
+    curve = metrics.accumulation(where)
+    assert list(curve.columns) == ['Observer', 'Date', 'Observations', 'Species']
+    assert sorted(curve.itertuples(index=False, name=None)) == sorted(expected)
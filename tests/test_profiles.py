@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+import bird_analysis as ba
+import bird_service
+from bird_profiles import SpeciesProfiles
+
+
+def test_record_missing_one_dimension_counts_towards_the_others():
+    frame = pd.DataFrame({
+        'Common_Name': ['Wren', 'Wren', 'Wren', 'Jay'],
+        'Initial_Three_Min_Cnt': [True, True, False, True],
+        'ID_Method': ['Singing', 'Calling', 'Singing', 'Singing'],
+        'Sky': ['Fog', np.nan, 'Fog', 'Fog'],
+    })
+    profiles = SpeciesProfiles.build(frame, ['ID_Method', 'Sky'])
+    wren = profiles.profile('Wren')
+    assert wren['ID_Method'].to_dict() == {'Calling': 1, 'Singing': 1}
+    assert wren['Sky'].to_dict() == {'Fog': 1}
+    assert profiles.species == ['Jay', 'Wren']
+    assert profiles.profile('Robin') == {}
+
+
+def test_profiles_match_species_detections(sample_csvs, use_source):
+    use_source('csv', sample_csvs)
+    profiles = bird_service.get_species_profiles('forest', ba.IN_DISTANCE_BANDS)
+    for species in profiles.species[:10]:
+        for dim, detections in profiles.profile(species).items():
+            expected = ba.species_detections('forest', species, dim)
+            assert detections.to_dict() == expected.to_dict(), (species, dim)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bird_analysis as ba
+from bird_data import load_observations
+from bird_schema import _cast, validate_schema
+
+
+def test_missing_flags_stay_missing():
+    flags = _cast(pd.Series(['True', None, 'False', 1, 0], name='PIF_Watchlist_Status'), 'bool')
+    assert flags.dtype == 'boolean'
+    assert flags.tolist() == [True, pd.NA, False, True, False]
+    with pytest.warns(UserWarning, match="1 unrecognized"):
+        assert _cast(pd.Series(['yes', 'True'], name='Flyover_Observed'), 'bool').isna().tolist() == [True, False]
+
+
+def test_missing_times_and_years_do_not_crash():
+    assert _cast(pd.Series(['07:10:00', None]), 'minutes').tolist() == [430, pd.NA]
+    assert _cast(pd.Series([2018, np.nan]), 'year').tolist() == [2018, pd.NA]
+    assert _cast(pd.Series(['2018-05-01', None]), 'year').tolist() == [2018, pd.NA]
+
+
+def test_blank_cells_load_on_every_backend(sample_csvs, use_source):
+    blanks = ['Start_Time', 'End_Time', 'Year', 'PIF_Watchlist_Status', 'Initial_Three_Min_Cnt']
+    raw = pd.read_csv(sample_csvs['forest']).astype({col: object for col in blanks})
+    raw.loc[0, blanks] = np.nan
+    raw.to_csv(sample_csvs['forest'], index=False)
+
+    frame = validate_schema(load_observations(sample_csvs['forest']))
+    assert frame.loc[0, ['End_Time', 'End_Hour', 'Year', 'PIF_Watchlist_Status']].isna().all()
+    assert pd.isna(frame.loc[0, 'Time_Group'])
+    assert frame.loc[0, 'Presence'] == 0
+
+    results = {}
+    for data_source in ('csv', 'chunked', 'duckdb'):
+        use_source(data_source, sample_csvs)
+        results[data_source] = (ba.status_counts('forest', 'PIF_Watchlist_Status'),
+                                ba.count_by('forest', 'Time_Group'))
+    expected = results.pop('csv')
+    assert expected[0].sum() == len(raw) - 1
+    for data_source, result in results.items():
+        for got, want in zip(result, expected):
+            pd.testing.assert_series_equal(got, want, check_names=False, check_index_type=False, obj=data_source)
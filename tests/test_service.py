@@ -0,0 +1,24 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import bird_service
+from conftest import ROOT
+
+
+def test_parse_habitats():
+    assert bird_service.parse_habitats('forest=a/forest, grassland = b.csv,') == {
+        'forest': 'a/forest', 'grassland': 'b.csv'}
+    with pytest.raises(ValueError):
+        bird_service.parse_habitats('forest')
+
+
+def test_habitats_from_environment(tmp_path):
+    env = dict(os.environ, BIRD_HABITATS=f'wetland={tmp_path}')
+    out = subprocess.run(
+        [sys.executable, '-c', 'import json, bird_service; print(json.dumps(bird_service.HABITATS))'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    assert json.loads(out) == {'wetland': str(tmp_path)}
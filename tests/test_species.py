@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from bird_species import SpeciesIndex
+
+
+def sample_frame(n=3000, seed=3):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'habitat': pd.Categorical(rng.choice(['forest', 'grassland'], n)),
+        'Observer': pd.Categorical(rng.choice(['Ann', 'Bo', 'Cy', 'Di'], n)),
+        'Admin_Unit_Code': pd.Categorical(rng.choice(['ANTI', 'CATO', 'MONO'], n)),
+        'Visit': rng.choice([1, 2], n),
+        'Common_Name': pd.Categorical(rng.choice([f'S{i:02d}' for i in range(40)], n)),
+    })
+    frame.loc[::97, 'Observer'] = np.nan
+    frame.loc[::89, 'Common_Name'] = np.nan
+    return frame
+
+
+def test_richness_grid_matches_groupby():
+    frame = sample_frame()
+    index = SpeciesIndex.build(frame, ['habitat', 'Observer', 'Admin_Unit_Code', 'Visit'])
+    for dims, where in [(['habitat', 'Observer', 'Admin_Unit_Code'], None),
+                        (['habitat', 'Visit'], (('Observer', ('Ann', 'Cy')),)),
+                        (['habitat', 'Observer'], (('Admin_Unit_Code', ('MONO',)), ('Visit', (2,))))]:
+        view = frame
+        for column, values in where or ():
+            view = view[view[column].isin(values)]
+        expected = view.groupby(dims, observed=True)['Common_Name'].nunique()
+        expected = expected[expected > 0]
+        result = index.richness_grid(dims, where)
+        assert result.to_dict() == expected.to_dict(), (dims, where)
+        assert list(result.index) == list(expected.index), (dims, where)
+
+
+def test_richness_grid_with_no_matching_rows():
+    index = SpeciesIndex.build(sample_frame(), ['habitat', 'Observer'])
+    assert index.richness_grid(['habitat'], (('Observer', ('Nobody',)),)).empty